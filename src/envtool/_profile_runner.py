@@ -0,0 +1,113 @@
+"""Executed inside the venv interpreter by `env profile` (passed via -c, stdlib only).
+
+argv: <out_prefix> <mode: profile|sample> <interval> <kind: script|module> <target> [args...]
+Writes <out_prefix>.json (and <out_prefix>.pstats in profile mode).
+Only what the runner cannot do without is imported before the target runs, so the target's
+own imports still show up in -X importtime; anything else is imported afterwards.
+"""
+import sys
+_STARTUP_MODULES = set(sys.modules)
+import os
+import time
+import runpy
+
+SENTINEL = "envtool-profile: start"
+END_SENTINEL = "envtool-profile: end"
+
+def _label(code_or_key):
+    filename, line, func = code_or_key
+    return {"file": filename, "line": line, "function": func}
+
+def main():
+    out_prefix, mode, interval, kind, target = sys.argv[1:6]
+    interval = float(interval)
+    sys.argv = [target] + sys.argv[6:]
+    if kind == "script":
+        sys.path[0] = os.path.dirname(os.path.abspath(target))
+
+    profiler, samples, sampler_thread = None, {}, None
+
+    def sampler():
+        while not stop.wait(interval):
+            frame = sys._current_frames().get(main_ident)
+            stack = []
+            while frame is not None and len(stack) < 64:
+                code = frame.f_code
+                stack.append((code.co_filename, code.co_firstlineno, code.co_name))
+                frame = frame.f_back
+            if stack:
+                key = ("self",) + stack[0]
+                samples[key] = samples.get(key, 0) + 1
+                for entry in set(stack):
+                    key = ("total",) + entry
+                    samples[key] = samples.get(key, 0) + 1
+
+    if mode == "profile":
+        # Imported before the sentinel so it doesn't show up in the target's import times
+        import cProfile
+        profiler = cProfile.Profile()
+    else:
+        import threading
+        stop = threading.Event()
+        main_ident = threading.get_ident()
+        sampler_thread = threading.Thread(target=sampler, daemon=True)
+        sampler_thread.start()
+
+    # Everything imported so far was loaded by the runner, not the target
+    preloaded = sorted(m for m in set(sys.modules) - _STARTUP_MODULES if "." not in m and not m.startswith("_"))
+    exit_code, error = 0, None
+    sys.stderr.write(SENTINEL + "\n")
+    sys.stderr.flush()
+    start = time.perf_counter()
+    try:
+        if profiler:
+            profiler.enable()
+        if kind == "module":
+            runpy.run_module(target, run_name="__main__", alter_sys=True)
+        else:
+            runpy.run_path(target, run_name="__main__")
+    except SystemExit as e:
+        exit_code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    except BaseException:
+        error = sys.exc_info()
+        exit_code = 1
+    finally:
+        if profiler:
+            profiler.disable()
+        if sampler_thread:
+            stop.set()
+            # The sampler must be done writing before the samples are aggregated
+            sampler_thread.join()
+    wall = time.perf_counter() - start
+    # Imports from here on are the runner's, not the target's
+    sys.stderr.write(END_SENTINEL + "\n")
+    sys.stderr.flush()
+    if error:
+        import traceback
+        traceback.print_exception(*error)
+
+    import json
+    import pstats
+    result = {"wall": wall, "exit_code": exit_code, "mode": mode, "functions": [], "preloaded": preloaded}
+    if profiler:
+        profiler.dump_stats(out_prefix + ".pstats")
+        for key, (cc, nc, tt, ct, _) in pstats.Stats(profiler).stats.items():
+            result["functions"].append(dict(_label(key), calls=nc, tottime=tt, cumtime=ct))
+    else:
+        total, own = {}, {}
+        for (kind_, *key), count in samples.items():
+            counts = own if kind_ == "self" else total
+            counts[tuple(key)] = counts.get(tuple(key), 0) + count
+        for key in set(total) | set(own):
+            result["functions"].append(dict(
+                _label(key), calls=None, tottime=own.get(key, 0) * interval, cumtime=total.get(key, 0) * interval,
+            ))
+    # The .pstats file keeps everything; the JSON summary only needs the heavy hitters
+    result["functions"].sort(key=lambda f: f["cumtime"], reverse=True)
+    result["functions"] = result["functions"][:500]
+    with open(out_prefix + ".json", "w") as f:
+        json.dump(result, f)
+    sys.exit(exit_code)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+"""Programmatic, non-printing interface to envtool.
+
+Every function here returns a typed result object (or raises EnvToolError) and never writes to
+the console, so envtool can be driven in-process by other tools. Each blocking function has an
+``a``-prefixed async variant that runs it in the default executor.
+
+    from envtool import api
+    info = api.create_venv("/path/to/project", python="3.11")
+    api.install_requirements(info.project)
+    print([p.name for p in api.list_packages(info.project)])
+"""
+import sys
+import json
+import asyncio
+import functools
+import subprocess
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional
+from envtool import venvs
+
+COMMON_VENV_NAMES = [".venv", "venv", "env"]
+
+class EnvToolError(Exception):
+    """Raised when an operation cannot be completed."""
+
+@dataclass
+class VenvInfo:
+    project: Path
+    path: Path
+    source: str  # "link", "detected" or "default"
+    exists: bool
+
+    @property
+    def python(self) -> Path:
+        return python_exe_for(self.path)
+
+@dataclass
+class CreateResult:
+    path: Path
+    created: bool
+    python: Optional[str] = None
+
+@dataclass
+class CommandResult:
+    ok: bool
+    returncode: int
+    stdout: str
+    stderr: str
+    args: List[str] = field(default_factory=list)
+
+    @property
+    def output(self) -> str:
+        return self.stdout + self.stderr
+
+@dataclass
+class FreezeResult:
+    path: Optional[Path]
+    requirements: List[str]
+
+    @property
+    def count(self) -> int:
+        return len(self.requirements)
+
+@dataclass
+class Package:
+    name: str
+    version: str
+
+@dataclass
+class GlobalEnv:
+    name: str
+    path: Path
+    size_bytes: int
+
+def _project(project):
+    return Path(project).resolve() if project else Path.cwd()
+
+def python_exe_for(venv_path):
+    venv_path = Path(venv_path)
+    if sys.platform == "win32":
+        return venv_path / "Scripts" / "python.exe"
+    return venv_path / "bin" / "python"
+
+def resolve_venv(project=None) -> VenvInfo:
+    """Find a project's venv: .envlink first, then common folder names, else the default name."""
+    project = _project(project)
+    link_file = project / ".envlink"
+    if link_file.exists():
+        try:
+            target_path = Path(link_file.read_text().strip())
+            if target_path.exists():
+                return VenvInfo(project, target_path, "link", True)
+        except OSError:
+            pass
+
+    for name in [venvs.ENV_NAME] + COMMON_VENV_NAMES:
+        local_path = project / name
+        if local_path.is_dir() and python_exe_for(local_path).exists():
+            return VenvInfo(project, local_path, "detected", True)
+
+    default = project / venvs.ENV_NAME
+    return VenvInfo(project, default, "default", default.exists())
+
+def _resolve_interpreter(python):
+    if not python:
+        return None
+    from envtool import pythons
+    resolved = pythons.resolve_python(python)
+    if not resolved:
+        raise EnvToolError(f"No Python interpreter matching '{python}' found.")
+    return resolved
+
+def create_venv(project=None, python=None, with_pip=True) -> CreateResult:
+    """Create the project's venv if it does not exist yet."""
+    info = resolve_venv(project)
+    interpreter = _resolve_interpreter(python)
+    with venvs.env_lock(info.path):
+        if info.path.exists():
+            return CreateResult(info.path, False, interpreter)
+        try:
+            venvs.build_venv_atomic(info.path, with_pip=with_pip, python=interpreter)
+        except (ValueError, subprocess.CalledProcessError) as e:
+            raise EnvToolError(f"Failed to create venv: {getattr(e, 'stderr', None) or e}") from e
+    return CreateResult(info.path, True, interpreter)
+
+def _run(args, cwd=None) -> CommandResult:
+    args = [str(a) for a in args]
+    proc = subprocess.run(args, capture_output=True, text=True, cwd=cwd)
+    return CommandResult(proc.returncode == 0, proc.returncode, proc.stdout, proc.stderr, args)
+
+def _require_venv(project):
+    info = resolve_venv(project)
+    if not info.python.exists():
+        raise EnvToolError(f"Virtual environment not found for {info.project}.")
+    return info
+
+def _pip(info):
+    """pip argv for a venv; pip-less envs go through the shared pip."""
+    from envtool import shared_pip
+    try:
+        return shared_pip.pip_command(info.path)
+    except shared_pip.SharedPipError as e:
+        raise EnvToolError(str(e)) from e
+    except (OSError, subprocess.CalledProcessError) as e:
+        raise EnvToolError(f"Could not set up the shared pip: {e}") from e
+
+def install_requirements(project=None, requirements=None, upgrade=False) -> CommandResult:
+    """pip install -r requirements.txt (or the given file) into the project's venv."""
+    info = _require_venv(project)
+    req_file = Path(requirements).resolve() if requirements else info.project / "requirements.txt"
+    if not req_file.exists():
+        raise EnvToolError(f"{req_file} not found.")
+    with venvs.env_lock(info.path):
+        args = _pip(info) + ["install"] + (["--upgrade"] if upgrade else []) + ["-r", req_file]
+        return _run(args, cwd=info.project)
+
+def install_packages(packages, project=None, upgrade=False) -> CommandResult:
+    """pip install the given requirement strings into the project's venv."""
+    info = _require_venv(project)
+    with venvs.env_lock(info.path):
+        args = _pip(info) + ["install"] + (["--upgrade"] if upgrade else []) + list(packages)
+        return _run(args, cwd=info.project)
+
+def freeze(project=None, write=True) -> FreezeResult:
+    """pip freeze the venv, optionally writing requirements.txt (keeping its comment lines)."""
+    info = _require_venv(project)
+    with venvs.env_lock(info.path, shared=True):
+        result = _run(_pip(info) + ["freeze"], cwd=info.project)
+    if not result.ok:
+        raise EnvToolError(f"pip freeze failed: {result.output.strip()}")
+    requirements = [l for l in result.stdout.splitlines() if l.strip()]
+    if not write:
+        return FreezeResult(None, requirements)
+
+    req_file = info.project / "requirements.txt"
+    comments = []
+    if req_file.exists():
+        comments = [l for l in req_file.read_text().splitlines(keepends=True) if l.strip().startswith("#")]
+    with open(req_file, "w") as f:
+        if comments:
+            f.writelines(comments)
+            f.write("\n")
+        f.write("\n".join(requirements) + ("\n" if requirements else ""))
+    return FreezeResult(req_file, requirements)
+
+def list_packages(project=None, python=None) -> List[Package]:
+    """Installed distributions, read straight from dist-info (or via pip for a non-venv interpreter)."""
+    if python:
+        result = _run([python, "-m", "pip", "list", "--format=json"])
+        if not result.ok:
+            raise EnvToolError(f"pip list failed: {result.output.strip()}")
+        try:
+            data = json.loads(result.stdout or "[]")
+        except ValueError as e:
+            raise EnvToolError("Could not parse pip list output.") from e
+        return [Package(p["name"], p["version"]) for p in data]
+
+    from envtool import sync
+    info = _require_venv(project)
+    installed = sync.scan_installed(info.path)
+    return sorted((Package(i["name"], i["version"]) for i in installed.values()), key=lambda p: p.name.lower())
+
+def _global_path(name):
+    if not venvs.is_valid_env_name(name):
+        raise EnvToolError(f"Invalid environment name '{name}'.")
+    return venvs.GLOBAL_ENV_BASE / name
+
+def list_global_envs(with_size=True) -> List[GlobalEnv]:
+    """Every environment in the global store."""
+    if not venvs.GLOBAL_ENV_BASE.exists():
+        return []
+    envs = []
+    for venv_dir in sorted(venvs.GLOBAL_ENV_BASE.iterdir()):
+        # Hidden entries are in-flight creates/removals
+        if venv_dir.is_dir() and not venv_dir.name.startswith("."):
+            size = sum(f.stat().st_size for f in venv_dir.rglob("*") if f.is_file()) if with_size else 0
+            envs.append(GlobalEnv(venv_dir.name, venv_dir, size))
+    return envs
+
+def create_global_env(name, python=None, with_pip=True) -> CreateResult:
+    """Create a named env in the global store; created=False if it already exists."""
+    target_path = _global_path(name)
+    interpreter = _resolve_interpreter(python)
+    venvs.GLOBAL_ENV_BASE.mkdir(parents=True, exist_ok=True)
+    with venvs.env_lock(target_path):
+        if target_path.exists():
+            return CreateResult(target_path, False, interpreter)
+        try:
+            venvs.build_venv_atomic(target_path, with_pip=with_pip, python=interpreter)
+        except (ValueError, subprocess.CalledProcessError) as e:
+            raise EnvToolError(f"Failed to create global environment: {getattr(e, 'stderr', None) or e}") from e
+    return CreateResult(target_path, True, interpreter)
+
+def link_global_env(name, project=None) -> Path:
+    """Point a project at a global env by writing .envlink. Returns the linked env path."""
+    target_path = _global_path(name)
+    if not target_path.exists():
+        raise EnvToolError(f"Global environment '{name}' does not exist.")
+    (_project(project) / ".envlink").write_text(str(target_path.resolve()))
+    return target_path
+
+def remove_global_env(name) -> bool:
+    """Delete a global env. Returns False if it did not exist."""
+    target_path = _global_path(name)
+    with venvs.env_lock(target_path):
+        if not target_path.exists():
+            return False
+        venvs.remove_venv_atomic(target_path)
+    return True
+
+def remove_all_global_envs() -> int:
+    """Delete every global env. Returns how many were removed."""
+    if not venvs.GLOBAL_ENV_BASE.exists():
+        return 0
+    removed = 0
+    for venv_dir in list(venvs.GLOBAL_ENV_BASE.iterdir()):
+        if venv_dir.name.startswith("."):
+            continue
+        with venvs.env_lock(venv_dir):
+            if venv_dir.is_dir():
+                venvs.remove_venv_atomic(venv_dir)
+                removed += 1
+            elif venv_dir.exists():
+                venv_dir.unlink()
+    return removed
+
+# --- Async variants ---
+
+def _async_variant(fn):
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(fn, *args, **kwargs))
+    wrapper.__name__ = wrapper.__qualname__ = f"a{fn.__name__}"
+    return wrapper
+
+aresolve_venv = _async_variant(resolve_venv)
+acreate_venv = _async_variant(create_venv)
+ainstall_requirements = _async_variant(install_requirements)
+ainstall_packages = _async_variant(install_packages)
+afreeze = _async_variant(freeze)
+alist_packages = _async_variant(list_packages)
+alist_global_envs = _async_variant(list_global_envs)
+acreate_global_env = _async_variant(create_global_env)
+alink_global_env = _async_variant(link_global_env)
+aremove_global_env = _async_variant(remove_global_env)
+aremove_all_global_envs = _async_variant(remove_all_global_envs)
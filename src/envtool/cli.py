@@ -5,20 +5,28 @@ import shutil
 import os
 from rich.table import Table
 from rich.tree import Tree
-from envtool import core, __version__
+from envtool import core, clone, provision, profiling, telemetry, __version__
+from envtool import matrix as test_matrix, pythons as interpreters, pack as packing, prune as pruning, sync as syncing, watch as watcher
 
 @click.group(invoke_without_command=True, context_settings=dict(help_option_names=['-h', '--help']))
 @click.option("--debug", is_flag=True, help="Show full stack Traces and detailed logs")
 @click.option("--python", "python_path", help="Specify Python version/path for venv creation")
+@click.option("--no-pip", is_flag=True, help="Create envs without pip; manage them with one shared pip")
 @click.pass_context
-def main(ctx, debug, python_path):
+def main(ctx, debug, python_path, no_pip):
     """🐍 Env Tool - Professional Python Virtual Environment Manager
     
     Developed by Ali Hamza
     """
     core.set_debug(debug)
+    if no_pip:
+        os.environ["ENVTOOL_NO_PIP"] = "1"
     if python_path:
         os.environ["ENVTOOL_PYTHON"] = python_path
+        if not interpreters.resolve_python(python_path):
+            core.console.print(f"[bold red]Error:[/bold red] No Python interpreter matching '{python_path}' found.")
+            core.console.print("Run [bold cyan]env pythons[/bold cyan] to see what is available.")
+            ctx.exit(1)
     
     if ctx.invoked_subcommand is None:
         # Default behavior: Setup environment / Toggle
@@ -39,7 +47,8 @@ def main(ctx, debug, python_path):
             core.console.print("Status: [bold yellow]INACTIVE[/bold yellow]")
             core.console.print("Running setup to ensure environment is ready...")
  
-        core.create_venv()
+        if not core.create_venv():
+            return
         core.upgrade_pip()
         
         # Ensure req.txt exists and check for dependencies
@@ -139,6 +148,11 @@ print(json.dumps(get_tree()))
     except Exception as e:
         core.console.print(f"[red]Error parsing tree data: {e}[/red]")
 
+@main.command()
+def pythons():
+    """List Python interpreters available for --python"""
+    interpreters.list_pythons()
+
 @main.command()
 def net():
     """Check internet connectivity status"""
@@ -225,6 +239,43 @@ def update():
     else:
         core.console.print(f"[red]{message}[/red]")
 
+@main.command()
+@click.option("--dry-run", is_flag=True, help="Show the plan without changing anything")
+@click.option("--keep-extras", is_flag=True, help="Do not uninstall packages missing from requirements.txt")
+def sync(dry_run, keep_extras):
+    """Install/remove only what differs from requirements.txt"""
+    core.console.print("🐍 [bold green]Env Tool - Sync Environment[/bold green]")
+    success, message = syncing.sync_dependencies(dry_run=dry_run, remove_extras=not keep_extras)
+    if success:
+        core.console.print(f"✅ {message}")
+    else:
+        core.console.print(f"[red]{message}[/red]")
+
+@main.command()
+@click.option("--write", is_flag=True, help="Drop unreferenced requirements from requirements.txt")
+@click.option("--include-tools", is_flag=True, help="Also drop packages that only provide console scripts")
+@click.option("--keep", multiple=True, help="Never report this package (repeatable)")
+@click.option("--path", "paths", multiple=True, help="Folders to scan instead of src/ and tests/ (repeatable)")
+def prune(write, include_tools, keep, paths):
+    """Report requirements that no project code imports"""
+    core.console.print("🐍 [bold green]Env Tool - Prune Requirements[/bold green]")
+    pruning.prune_report(write=write, include_tools=include_tools, keep=keep, dirs=paths or None)
+
+@main.command()
+@click.option("--prune", is_flag=True, help="Also uninstall packages dropped from requirements.txt")
+@click.option("--poll", is_flag=True, help="Force stat polling instead of inotify")
+def watch(prune, poll):
+    """Sync the venv whenever requirements.txt changes"""
+    core.console.print("🐍 [bold green]Env Tool - Watch Mode[/bold green]")
+    watcher.watch_project(prune=prune, use_polling=poll)
+
+@main.command()
+@click.option("-n", "--limit", default=15, help="Number of packages to show")
+def stats(limit):
+    """Show which packages cost the most install time"""
+    core.console.print("🐍 [bold green]Env Tool - Install Telemetry[/bold green]")
+    telemetry.display_stats(limit)
+
 @main.command(context_settings=dict(ignore_unknown_options=True))
 @click.argument("command", nargs=-1, required=True)
 @click.option("--shell", is_flag=True, help="Run command inside a system shell (enables pipes/redirects)")
@@ -238,10 +289,53 @@ def run(command, shell):
         # Simple substitution for 'python' keyword
         if full_command.startswith("python"):
             full_command = full_command.replace("python", str(python_exe), 1)
-        core.run_command([full_command], shell=True)
+        with core.env_lock(core.get_venv_path(), shared=True):
+            core.run_command([full_command], shell=True)
     else:
         core.run_in_venv(cmd_list)
 
+@main.command()
+@click.argument("output", default="myenv.tar.gz")
+@click.option("-g", "--global", "global_name", help="Pack a global environment instead of the project venv")
+@click.option("--no-pycache", is_flag=True, help="Skip __pycache__ folders")
+@click.option("--no-tests", is_flag=True, help="Skip tests/ folders inside installed packages")
+def pack(output, global_name, no_pycache, no_tests):
+    """Stream the venv into a relocatable archive ('-' for stdout)"""
+    packing.pack_venv(output, global_name, skip_pycache=no_pycache, skip_tests=no_tests)
+
+@main.command()
+@click.argument("archive")
+@click.argument("dest", required=False)
+@click.option("-g", "--global", "global_name", help="Unpack into the global store under this name")
+def unpack(archive, dest, global_name):
+    """Extract a packed venv and fix its paths ('-' for stdin)"""
+    packing.unpack_venv(archive, dest, global_name)
+
+@main.command(context_settings=dict(ignore_unknown_options=True))
+@click.argument("command", nargs=-1)
+@click.option("-p", "--python", "versions", multiple=True, help="Interpreter to include (repeatable). Defaults to every installed minor version")
+@click.option("-j", "--jobs", type=int, help="Maximum parallel environments")
+@click.option("--show-output", is_flag=True, help="Print output of passing environments too")
+def matrix(command, versions, jobs, show_output):
+    """Run a command across one venv per Python version in parallel"""
+    core.console.print("🐍 [bold green]Env Tool - Test Matrix[/bold green]")
+    if not test_matrix.run_matrix(versions, command, jobs=jobs, show_all=show_output):
+        sys.exit(1)
+
+@main.command(context_settings=dict(ignore_unknown_options=True, allow_interspersed_args=False))
+@click.argument("target")
+@click.argument("args", nargs=-1, type=click.UNPROCESSED)
+@click.option("-m", "--module", is_flag=True, help="Treat TARGET as a module name (like python -m)")
+@click.option("--sample", is_flag=True, help="Use a low-overhead sampling profiler instead of cProfile")
+@click.option("--interval", default=0.005, show_default=True, help="Sampling interval in seconds")
+@click.option("--top", default=20, show_default=True, help="Rows to show per table")
+@click.option("--no-imports", is_flag=True, help="Skip -X importtime analysis")
+def profile(target, args, module, sample, interval, top, no_imports):
+    """Profile a script inside the venv (functions + imports)"""
+    core.console.print("🐍 [bold green]Env Tool - Profiler[/bold green]")
+    if not profiling.profile_target(target, args, module=module, sample=sample, interval=interval, top=top, imports=not no_imports):
+        sys.exit(1)
+
 @main.command()
 def clean():
     """Reset project by removing venv and cache folders"""
@@ -429,6 +523,25 @@ def g_use(name):
     core.console.print("🌍 [bold green]Env Tool - Global Linking[/bold green]")
     core.link_project_to_global(name)
 
+@g.command(name="clone")
+@click.argument("src")
+@click.argument("dst")
+def g_clone(src, dst):
+    """Fork a global environment (copy-on-write where supported)"""
+    core.console.print("🌍 [bold green]Env Tool - Clone Global Environment[/bold green]")
+    clone.clone_global_venv(src, dst)
+
+@g.command(name="apply")
+@click.argument("manifest", type=click.Path(exists=True, dir_okay=False))
+@click.option("-j", "--jobs", type=int, help="Max environments built at once (default: CPU count)")
+@click.option("--dry-run", is_flag=True, help="Show what would change without building anything")
+@click.option("--prune", is_flag=True, help="Also uninstall packages the manifest does not require")
+def g_apply(manifest, jobs, dry_run, prune):
+    """Create or update global environments from an envs.toml manifest"""
+    core.console.print("🌍 [bold green]Env Tool - Apply Manifest[/bold green]")
+    if not provision.apply_manifest(manifest, jobs=jobs, dry_run=dry_run, prune=prune):
+        sys.exit(1)
+
 @g.command(name="clean")
 @click.argument("name", required=False)
 @click.option("--all", "remove_all", is_flag=True, help="Remove all global environments")
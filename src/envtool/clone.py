@@ -0,0 +1,128 @@
+import os
+import sys
+import time
+import shutil
+from contextlib import ExitStack
+from pathlib import Path
+from envtool import core
+
+# Linux ioctl number for FICLONE (share extents copy-on-write: btrfs, XFS, bcachefs, ...)
+FICLONE = 0x40049409
+
+# Files a venv edits in place. Hardlinking these would let the clone write through to the source.
+MUTABLE_SUFFIXES = {".pth", ".cfg"}
+MUTABLE_DIST_INFO = {"RECORD", "INSTALLER", "REQUESTED", "direct_url.json"}
+
+def _reflink(src, dst):
+    """Clone a file's extents. Raises OSError when the filesystem can't do it."""
+    if not sys.platform.startswith("linux"):
+        raise OSError("reflink not supported on this platform")
+    import fcntl
+    with open(src, "rb") as s, open(dst, "wb") as d:
+        try:
+            fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+        except OSError:
+            d.close()
+            os.unlink(dst)
+            raise
+    shutil.copystat(src, dst)
+
+def _is_mutable(rel_path):
+    parts = rel_path.parts
+    if len(parts) == 1 or parts[0] in ("bin", "Scripts"):
+        return True
+    if rel_path.suffix in MUTABLE_SUFFIXES:
+        return True
+    return rel_path.parent.name.endswith(".dist-info") and rel_path.name in MUTABLE_DIST_INFO
+
+def clone_tree(src, dst, final_dst=None):
+    """Clone a venv directory. Uses reflinks when possible, else hardlinks plus real copies of mutable files."""
+    src, dst = Path(src), Path(dst)
+    final_str = str(Path(final_dst or dst).resolve())
+    stats = {"reflinked": 0, "linked": 0, "copied": 0}
+    use_reflink = True
+    src_str = str(src.resolve())
+
+    for root, dirs, files in os.walk(src):
+        root = Path(root)
+        target_root = dst / root.relative_to(src)
+        target_root.mkdir(exist_ok=True)
+        shutil.copystat(root, target_root)
+
+        for name in dirs + files:
+            src_file = root / name
+            dst_file = target_root / name
+            if src_file.is_symlink():
+                link = os.readlink(src_file)
+                # Links pointing back into the source env must follow the clone
+                if link.startswith(src_str):
+                    link = final_str + link[len(src_str):]
+                os.symlink(link, dst_file)
+                stats["copied"] += 1
+                continue
+            if name in dirs:
+                continue
+
+            if use_reflink:
+                try:
+                    _reflink(src_file, dst_file)
+                    stats["reflinked"] += 1
+                    continue
+                except OSError:
+                    use_reflink = False
+                    if core.DEBUG_MODE:
+                        core.console.print("[dim]Reflinks unavailable, falling back to hardlinks.[/dim]")
+
+            if _is_mutable(src_file.relative_to(src)):
+                shutil.copy2(src_file, dst_file)
+                stats["copied"] += 1
+                continue
+            try:
+                os.link(src_file, dst_file)
+                stats["linked"] += 1
+            except OSError:
+                shutil.copy2(src_file, dst_file)
+                stats["copied"] += 1
+    return stats
+
+def clone_global_venv(src_name, dst_name):
+    """Fork a global environment into a new one without reinstalling anything"""
+    for name in (src_name, dst_name):
+        if not core.is_valid_env_name(name):
+            core.console.print(f"[bold red]Error:[/bold red] Invalid environment name '{name}'.")
+            return False
+
+    src_path = core.GLOBAL_ENV_BASE / src_name
+    dst_path = core.GLOBAL_ENV_BASE / dst_name
+    if not src_path.exists():
+        core.console.print(f"[bold red]Global environment '{src_name}' does not exist.[/bold red]")
+        return False
+
+    start = time.perf_counter()
+    # Locks are always taken in lock-path order, so clones running in opposite directions can't deadlock
+    locks = sorted([(src_path, True), (dst_path, False)], key=lambda l: str(core.get_lock_path(l[0])))
+    with ExitStack() as stack:
+        for path, shared in locks:
+            stack.enter_context(core.env_lock(path, shared=shared))
+        if dst_path.exists():
+            core.console.print(f"[yellow]Global environment '{dst_name}' already exists.[/yellow]")
+            return False
+
+        tmp_path = core.GLOBAL_ENV_BASE / f".{dst_name}.tmp-{os.getpid()}"
+        if tmp_path.exists():
+            shutil.rmtree(tmp_path)
+        try:
+            with core.console.status(f"[bold yellow]Cloning {src_name} → {dst_name}...", spinner="dots"):
+                stats = clone_tree(src_path, tmp_path, final_dst=dst_path)
+                core.rewrite_venv_paths(tmp_path, core.path_forms(src_path), dst_path.resolve())
+                os.rename(tmp_path, dst_path)
+        except BaseException:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            raise
+
+    elapsed = time.perf_counter() - start
+    core.console.print(f"✅ Global environment [bold cyan]{dst_name}[/bold cyan] cloned from [bold]{src_name}[/bold] in {elapsed:.2f}s")
+    core.console.print(
+        f"[dim]{stats['reflinked']} reflinked, {stats['linked']} hardlinked, {stats['copied']} copied[/dim]"
+    )
+    return True
@@ -1,19 +1,22 @@
 import os
 import sys
 import subprocess
-import venv
 import shutil
 import requests
 from pathlib import Path
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn
 from rich.table import Table
+from envtool import api, venvs
+# Store primitives live in venvs (shared with the API); re-exported here for existing callers
+from envtool.venvs import (
+    ENV_NAME, GLOBAL_ENV_BASE, LOCK_DIR, LAUNCHER_SHEBANG_RE, is_valid_env_name, get_lock_path,
+    path_forms, rewrite_venv_paths, build_venv_atomic, remove_venv_atomic,
+)
 
 console = Console()
-ENV_NAME = "myenv"
 DEBUG_MODE = False
 GITHUB_REPO = "AliHamza-Coder/env-tool"
-GLOBAL_ENV_BASE = Path.home() / ".envtool" / "envs"
 
 def set_debug(enabled):
     global DEBUG_MODE
@@ -21,48 +24,41 @@ def set_debug(enabled):
 
 def get_venv_path():
     """Get the path to the virtual environment, checking for local, linked, or common default names."""
-    # 1. Check for .envlink (Global Link) - Highest Priority
-    link_file = Path.cwd() / ".envlink"
-    if link_file.exists():
-        try:
-            target_path = Path(link_file.read_text().strip())
-            if target_path.exists():
-                return target_path
-        except Exception:
-            pass
-
-    # 2. Smart Detection: Search for common venv names
-    common_names = [ENV_NAME, ".venv", "venv", "env"]
-    for name in common_names:
-        local_path = Path.cwd() / name
-        # Check if it's a directory and looks like a venv (contains python binary)
-        if local_path.is_dir():
-            if sys.platform == "win32":
-                if (local_path / "Scripts" / "python.exe").exists(): return local_path
-            else:
-                if (local_path / "bin" / "python").exists(): return local_path
-        
-    return Path.cwd() / ENV_NAME # Fallback to default name
+    return api.resolve_venv().path
 
 def get_python_exe():
-    venv_path = get_venv_path()
-    if sys.platform == "win32":
-        return venv_path / "Scripts" / "python.exe"
-    return venv_path / "bin" / "python"
-
-def get_pip_exe():
-    venv_path = get_venv_path()
-    if sys.platform == "win32":
-        return venv_path / "Scripts" / "pip.exe"
-    return venv_path / "bin" / "pip"
+    return api.python_exe_for(get_venv_path())
 
 def create_venv():
     venv_path = get_venv_path()
     if not venv_path.exists():
-        with console.status("[bold yellow]Creating virtual environment...", spinner="dots"):
-            venv.create(venv_path, with_pip=True)
+        try:
+            from envtool import shared_pip
+            with console.status("[bold yellow]Creating virtual environment...", spinner="dots"):
+                venv_path = api.create_venv(with_pip=not shared_pip.pipless_requested()).path
+        except api.EnvToolError as e:
+            console.print(f"[bold red]Error:[/bold red] {e}")
+            return None
     return venv_path
 
+# --- Environment Locking ---
+
+def env_lock(venv_path, shared=False, quiet=False):
+    """Hold a reader (shared) or writer (exclusive) lock on a venv, reporting waits on the console."""
+    if quiet:
+        return venvs.env_lock(venv_path, shared)
+
+    def on_wait():
+        # Plain print rather than a spinner: callers often already hold a console.status
+        mode = "read" if shared else "write"
+        console.print(f"[dim]Waiting for {mode} lock on {Path(venv_path).name}...[/dim]")
+
+    def on_acquire(lock_path):
+        if DEBUG_MODE:
+            console.print(f"[dim]Acquired {'shared' if shared else 'exclusive'} lock: {lock_path}[/dim]")
+
+    return venvs.env_lock(venv_path, shared, on_wait=on_wait, on_acquire=on_acquire)
+
 def run_command(args, capture_output=False, shell=False):
     if DEBUG_MODE:
         console.print(f"[dim]Executing: {' '.join(args)}[/dim]")
@@ -86,12 +82,22 @@ def run_command(args, capture_output=False, shell=False):
         return None
 
 def upgrade_pip():
+    from envtool import shared_pip
+    if not shared_pip.has_own_pip(get_venv_path()):
+        # Pip-less env: the shared pip is pinned and only ever installed once per machine
+        try:
+            with console.status("[bold yellow]Preparing shared pip...", spinner="dots"):
+                shared_pip.ensure_shared_pip()
+        except shared_pip.SharedPipError as e:
+            console.print(f"[bold red]Error:[/bold red] {e}")
+        return
+
     if not is_online():
         if DEBUG_MODE: console.print("[dim]Offline: Skipping pip upgrade.[/dim]")
         return
         
     python_exe = get_python_exe()
-    with console.status("[bold yellow]Upgrading pip...", spinner="dots"):
+    with env_lock(get_venv_path()), console.status("[bold yellow]Upgrading pip...", spinner="dots"):
         run_command([str(python_exe), "-m", "pip", "install", "--upgrade", "pip"])
 
 def install_requirements():
@@ -114,48 +120,36 @@ def install_requirements():
         if len(lines) > 10: console.print(f" [dim]... and {len(lines)-10} more[/dim]")
         console.print("")
 
-        with console.status("[bold yellow]Installing dependencies...", spinner="dots"):
-            pip_exe = get_pip_exe()
-            # We run without capture_output to let Pip's progress bars show up if it's an interactive TTY
-            # or just to see real-time log.
-            run_command([str(pip_exe), "install", "-r", str(req_file)])
+        from envtool import shared_pip, telemetry
+        with env_lock(get_venv_path()):
+            try:
+                pip_cmd = shared_pip.pip_command(get_venv_path())
+            except shared_pip.SharedPipError as e:
+                console.print(f"[bold red]Error:[/bold red] {e}")
+                return
+            # Pip's output is streamed into a live progress display and timed per package
+            result = telemetry.run_pip(pip_cmd + ["install", "-r", str(req_file)])
         
-        console.print("✅ [bold green]Packages installed correctly.[/bold green]")
+        if result:
+            console.print("✅ [bold green]Packages installed correctly.[/bold green]")
     else:
         console.print("[yellow]requirements.txt is empty. Skipping install.[/yellow]")
 
 def freeze_dependencies():
-    pip_exe = get_pip_exe()
-    if not pip_exe.exists():
+    if not get_python_exe().exists():
         return False, "Virtual environment not found. Run 'env' first."
     
     try:
+        # Comments in an existing requirements.txt are preserved
         with console.status("[bold yellow]Freezing dependencies...", spinner="dots"):
-            # Preserve comments from existing requirements.txt
-            comments = []
-            req_file = Path.cwd() / "requirements.txt"
-            if req_file.exists():
-                with open(req_file, "r") as f:
-                    comments = [line for line in f.readlines() if line.strip().startswith("#")]
-
-            result = run_command([str(pip_exe), "freeze"], capture_output=True)
-            if result:
-                with open("requirements.txt", "w") as f:
-                    if comments:
-                        f.writelines(comments)
-                        f.write("\n")
-                    f.write(result.stdout)
-                
-                count = len(result.stdout.strip().split("\n")) if result.stdout.strip() else 0
-                return True, f"Dependencies frozen to requirements.txt ({count} packages)"
+            result = api.freeze()
+        return True, f"Dependencies frozen to requirements.txt ({result.count} packages)"
     except Exception as e:
         if DEBUG_MODE: console.print_exception()
         return False, str(e)
-    return False, "Failed to freeze dependencies"
 
 def update_dependencies():
-    pip_exe = get_pip_exe()
-    if not pip_exe.exists():
+    if not get_python_exe().exists():
         return False, "Virtual environment not found. Run 'env' first."
     
     req_file = Path.cwd() / "requirements.txt"
@@ -168,8 +162,13 @@ def update_dependencies():
     console.print("\n[bold yellow]🔄 Updating Environment Packages...[/bold yellow]")
     console.print("[dim]This will synchronize all packages with requirements.txt and upgrade to latest allowed versions.[/dim]\n")
 
-    with console.status("[bold yellow]Updating...", spinner="dots"):
-        result = run_command([str(pip_exe), "install", "--upgrade", "-r", str(req_file)])
+    from envtool import shared_pip, telemetry
+    with env_lock(get_venv_path()):
+        try:
+            pip_cmd = shared_pip.pip_command(get_venv_path())
+        except shared_pip.SharedPipError as e:
+            return False, str(e)
+        result = telemetry.run_pip(pip_cmd + ["install", "--upgrade", "-r", str(req_file)], label="Updating")
         if result:
             return True, "Environment updated successfully."
     return False, "Failed to update dependencies."
@@ -187,7 +186,8 @@ def run_in_venv(args):
     if args[0] == "python":
         args[0] = str(python_exe)
     
-    run_command(args)
+    with env_lock(get_venv_path(), shared=True):
+        run_command(args)
 
 def load_env():
     """Load variables from a .env file into the environment if it exists."""
@@ -241,28 +241,20 @@ def list_dependencies():
     is_active = is_venv_active()
     context_name = f"Environment: [bold cyan]{ENV_NAME}[/bold cyan]" if is_active else "Environment: [bold yellow]Global (Laptop)[/bold yellow]"
     
-    python_exe = get_python_exe() if is_active else sys.executable
-    
     with console.status(f"[dim]Fetching packages for {context_name}...", spinner="dots"):
-        result = run_command([str(python_exe), "-m", "pip", "list", "--format=json"], capture_output=True)
-    
-    if not result:
-        console.print("[red]Failed to retrieve package list.[/red]")
-        return
-
-    import json
-    try:
-        packages = json.loads(result.stdout)
-    except Exception:
-        console.print("[red]Error parsing package list.[/red]")
-        return
+        try:
+            # The venv is read straight from dist-info; the global interpreter goes through pip
+            packages = api.list_packages() if is_active else api.list_packages(python=sys.executable)
+        except api.EnvToolError as e:
+            console.print(f"[red]Failed to retrieve package list: {e}[/red]")
+            return
 
     table = Table(title=f"📦 {context_name}", box=None)
     table.add_column("Package", style="cyan")
     table.add_column("Version", style="green")
 
     for pkg in packages:
-        table.add_row(pkg.get("name"), pkg.get("version"))
+        table.add_row(pkg.name, pkg.version)
 
     console.print("\n")
     console.print(table)
@@ -306,7 +298,7 @@ def init_project():
     gitignore = Path.cwd() / ".gitignore"
     if not gitignore.exists():
         with open(gitignore, "w") as f:
-            f.write("__pycache__/\n*.py[cod]\nmyenv/\n.venv/\nvenv/\nenv/\n.env\n.envlink\n.vscode/\n")
+            f.write("__pycache__/\n*.py[cod]\nmyenv/\n.venv/\nvenv/\nenv/\n.env\n.envlink\n.envtool-profiles/\n.vscode/\n")
         created.append(".gitignore")
     else:
         # Update existing gitignore with .envlink if missing
@@ -407,23 +399,28 @@ def display_network_status():
 
 def create_global_venv(name):
     """Create a virtual environment in the global central store"""
-    if not GLOBAL_ENV_BASE.exists():
-        GLOBAL_ENV_BASE.mkdir(parents=True, exist_ok=True)
-    
-    target_path = GLOBAL_ENV_BASE / name
-    if target_path.exists():
+    if not is_valid_env_name(name):
+        console.print(f"[bold red]Error:[/bold red] Invalid environment name '{name}'.")
+        return False
+
+    from envtool import shared_pip
+    try:
+        with console.status(f"[bold yellow]Creating global environment: {name}...", spinner="dots"):
+            result = api.create_global_env(name, with_pip=not shared_pip.pipless_requested())
+    except api.EnvToolError as e:
+        console.print(f"[bold red]Error:[/bold red] {e}")
+        return False
+
+    if not result.created:
         console.print(f"[yellow]Global environment '{name}' already exists.[/yellow]")
         return False
-    
-    with console.status(f"[bold yellow]Creating global environment: {name}...", spinner="dots"):
-        venv.create(target_path, with_pip=True)
-    
-    console.print(f"✅ Global environment [bold cyan]{name}[/bold cyan] created at {target_path}")
+    console.print(f"✅ Global environment [bold cyan]{name}[/bold cyan] created at {result.path}")
     return True
 
 def list_global_envs():
     """List all centrally stored virtual environments"""
-    if not GLOBAL_ENV_BASE.exists() or not any(GLOBAL_ENV_BASE.iterdir()):
+    envs = api.list_global_envs()
+    if not envs:
         console.print("[dim]No global environments found.[/dim]")
         return
     
@@ -432,25 +429,21 @@ def list_global_envs():
     table.add_column("Size", style="dim")
     table.add_column("Path", style="dim")
     
-    for venv_dir in GLOBAL_ENV_BASE.iterdir():
-        if venv_dir.is_dir():
-            # Rough size calculation
-            size = sum(f.stat().st_size for f in venv_dir.rglob('*') if f.is_file())
-            size_mb = f"{size / (1024 * 1024):.1f} MB"
-            table.add_row(venv_dir.name, size_mb, str(venv_dir))
+    for env in envs:
+        size_mb = f"{env.size_bytes / (1024 * 1024):.1f} MB"
+        table.add_row(env.name, size_mb, str(env.path))
             
     console.print(table)
 
 def link_project_to_global(name):
     """Link the current directory to a global virtual environment"""
-    target_path = GLOBAL_ENV_BASE / name
-    if not target_path.exists():
-        console.print(f"[bold red]Global environment '{name}' does not exist.[/bold red]")
+    try:
+        api.link_global_env(name)
+    except api.EnvToolError as e:
+        console.print(f"[bold red]{e}[/bold red]")
         console.print("Run [bold cyan]env g create " + name + "[/bold cyan] first.")
         return False
     
-    link_file = Path.cwd() / ".envlink"
-    link_file.write_text(str(target_path.resolve()))
     console.print(f"✅ Project linked to global environment: [bold cyan]{name}[/bold cyan]")
     return True
 
@@ -461,26 +454,20 @@ def remove_global_venv(name=None, remove_all=False):
     
     if remove_all:
         with console.status("[bold red]Deleting all global environments...", spinner="dots"):
-            shutil.rmtree(GLOBAL_ENV_BASE)
-            GLOBAL_ENV_BASE.mkdir()
+            api.remove_all_global_envs()
         console.print("✅ [bold green]All global environments cleared.[/bold green]")
         return
     
     if name:
-        # Path Injection Protection
-        if ".." in name or "/" in name or "\\" in name:
-            console.print(f"[bold red]Error:[/bold red] Invalid environment name '{name}'.")
-            return
-            
-        target_path = (GLOBAL_ENV_BASE / name).resolve()
-        # Verify it's actually within the GLOBAL_ENV_BASE
-        if not str(target_path).startswith(str(GLOBAL_ENV_BASE.resolve())):
-            console.print(f"[bold red]Error:[/bold red] Security violation. Path outside of global store.")
+        # Path Injection Protection: api rejects anything but a single path component
+        try:
+            with console.status(f"[bold red]Deleting global env {name}...", spinner="dots"):
+                removed = api.remove_global_env(name)
+        except api.EnvToolError as e:
+            console.print(f"[bold red]Error:[/bold red] {e}")
             return
 
-        if target_path.exists():
-            with console.status(f"[bold red]Deleting global env {name}...", spinner="dots"):
-                shutil.rmtree(target_path)
+        if removed:
             console.print(f"✅ Global environment [bold]{name}[/bold] removed.")
         else:
             console.print(f"[red]Global environment '{name}' not found.[/red]")
@@ -0,0 +1,133 @@
+import os
+import sys
+import time
+import subprocess
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from rich.table import Table
+from rich.panel import Panel
+from envtool import core, pythons, shared_pip, sync
+
+def _minor(version):
+    return ".".join(version.split(".")[:2])
+
+def default_interpreters():
+    """Newest interpreter of every minor version found on the machine."""
+    seen = {}
+    for py in pythons.discover_pythons():
+        if py.get("has_venv", True):
+            seen.setdefault(_minor(py["version"]), py["executable"])
+    return seen
+
+def _bin_dir(venv_path):
+    return venv_path / ("Scripts" if sys.platform == "win32" else "bin")
+
+def prepare_env(version, python, req_file):
+    """Create or reuse myenv-<version> and bring it up to date with requirements.txt."""
+    venv_path = Path.cwd() / f"{core.ENV_NAME}-{version}"
+    python_exe = _bin_dir(venv_path) / ("python.exe" if sys.platform == "win32" else "python")
+    with core.env_lock(venv_path):
+        if not python_exe.exists():
+            core.build_venv_atomic(venv_path, with_pip=not shared_pip.pipless_requested(), python=python)
+        if req_file.exists() and req_file.stat().st_size > 0:
+            to_install, _, parsed = sync.compute_sync_plan(req_file, venv_path, python_exe)
+            if to_install or parsed["unmanaged"]:
+                subprocess.run(
+                    shared_pip.pip_command(venv_path) + ["install", "-q", "-r", str(req_file)],
+                    check=True, capture_output=True, text=True,
+                )
+    return venv_path
+
+def run_in_env(venv_path, command):
+    """Run a command with the venv's bin directory first on PATH. Returns (returncode, output, seconds)."""
+    bin_dir = _bin_dir(venv_path)
+    args = list(command)
+    if args and args[0] == "python":
+        args[0] = str(bin_dir / ("python.exe" if sys.platform == "win32" else "python"))
+    env = dict(os.environ, VIRTUAL_ENV=str(venv_path), PATH=f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}")
+    env.pop("PYTHONHOME", None)
+
+    start = time.perf_counter()
+    with core.env_lock(venv_path, shared=True):
+        try:
+            result = subprocess.run(args, capture_output=True, text=True, env=env)
+            code, output = result.returncode, result.stdout + result.stderr
+        except OSError as e:
+            code, output = 127, str(e)
+    return code, output, time.perf_counter() - start
+
+def run_matrix(versions, command, jobs=None, show_all=False):
+    """Prepare one venv per interpreter concurrently, then run `command` in all of them in parallel"""
+    if versions:
+        targets = {}
+        discovered = {p["executable"]: p["version"] for p in pythons.discover_pythons()}
+        for spec in versions:
+            python = pythons.resolve_python(spec)
+            if not python:
+                core.console.print(f"[bold red]Error:[/bold red] No Python interpreter matching '{spec}' found.")
+                return False
+            version = discovered.get(os.path.realpath(python))
+            if not version:
+                # A path outside the discovered set: ask the interpreter itself
+                version = (pythons._probe(os.path.realpath(python)) or {}).get("version")
+            if not version:
+                core.console.print(f"[bold red]Error:[/bold red] Could not determine the version of '{spec}'.")
+                return False
+            targets[_minor(version)] = python
+    else:
+        targets = default_interpreters()
+    if not targets:
+        core.console.print("[red]No interpreters found. Run 'env pythons' to check.[/red]")
+        return False
+
+    req_file = Path.cwd() / "requirements.txt"
+    jobs = jobs or min(len(targets), os.cpu_count() or 4)
+    core.load_env()
+
+    envs, failed_setup = {}, {}
+    with core.console.status(f"[bold yellow]Preparing {len(targets)} environments...", spinner="dots") as status:
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            futures = {pool.submit(prepare_env, v, py, req_file): v for v, py in targets.items()}
+            for done, future in enumerate(as_completed(futures), 1):
+                version = futures[future]
+                try:
+                    envs[version] = future.result()
+                except subprocess.CalledProcessError as e:
+                    failed_setup[version] = (e.stderr or e.stdout or str(e)).strip()
+                except Exception as e:
+                    failed_setup[version] = str(e)
+                status.update(f"[bold yellow]Preparing environments... ({done}/{len(targets)})")
+
+    results = {}
+    if command:
+        with core.console.status(f"[bold yellow]Running across {len(envs)} environments...", spinner="dots") as status:
+            with ThreadPoolExecutor(max_workers=jobs) as pool:
+                futures = {pool.submit(run_in_env, path, command): v for v, path in envs.items()}
+                for done, future in enumerate(as_completed(futures), 1):
+                    results[futures[future]] = future.result()
+                    status.update(f"[bold yellow]Running... ({done}/{len(envs)})")
+
+    table = Table(title="🧪 [bold green]Matrix Summary[/bold green]", box=None)
+    table.add_column("Python", style="cyan")
+    table.add_column("Env", style="dim")
+    table.add_column("Status")
+    table.add_column("Time", justify="right", style="dim")
+    for version in sorted(targets, key=pythons.version_key):
+        env_name = f"{core.ENV_NAME}-{version}"
+        if version in failed_setup:
+            table.add_row(version, env_name, "[red]SETUP FAILED[/red] ❌", "-")
+        elif version in results:
+            code, _, seconds = results[version]
+            status = "[green]PASS[/green] ✅" if code == 0 else f"[red]FAIL ({code})[/red] ❌"
+            table.add_row(version, env_name, status, f"{seconds:.1f}s")
+        else:
+            table.add_row(version, env_name, "[green]READY[/green]", "-")
+
+    for version, error in sorted(failed_setup.items()):
+        core.console.print(Panel(error[-3000:], title=f"Setup {version}", border_style="red"))
+    for version, (code, output, _) in sorted(results.items(), key=lambda item: pythons.version_key(item[0])):
+        if output.strip() and (show_all or code != 0):
+            core.console.print(Panel(output.rstrip()[-3000:], title=f"Python {version}", border_style="red" if code else "green"))
+
+    core.console.print(table)
+    return not failed_setup and all(code == 0 for code, _, _ in results.values())
@@ -0,0 +1,152 @@
+import io
+import os
+import sys
+import json
+import shutil
+import tarfile
+from pathlib import Path
+from rich.console import Console
+from envtool import core, __version__
+
+MANIFEST_NAME = ".envtool-pack.json"
+COMPRESSION_BY_SUFFIX = {
+    ".tar.gz": "gz", ".tgz": "gz",
+    ".tar.xz": "xz", ".txz": "xz",
+    ".tar.bz2": "bz2",
+    ".tar": "",
+}
+
+def _compression_for(path):
+    name = str(path).lower()
+    for suffix, mode in COMPRESSION_BY_SUFFIX.items():
+        if name.endswith(suffix):
+            return mode
+    return "gz"
+
+def _resolve_source(global_name=None):
+    if global_name:
+        if not core.is_valid_env_name(global_name):
+            return None
+        return core.GLOBAL_ENV_BASE / global_name
+    return core.get_venv_path()
+
+def pack_venv(output, global_name=None, skip_pycache=False, skip_tests=False):
+    """Stream a venv into a compressed tar archive. Use '-' as output to write to stdout."""
+    venv_path = _resolve_source(global_name)
+    if venv_path is None or not venv_path.exists():
+        core.console.print("[bold red]Venv not found.[/bold red] Nothing to pack.")
+        return False
+
+    excluded = set()
+    if skip_pycache:
+        excluded.add("__pycache__")
+    if skip_tests:
+        excluded.update({"tests", "test"})
+
+    def _filter(info):
+        if excluded.intersection(Path(info.name).parts):
+            return None
+        return info
+
+    manifest = json.dumps({
+        "prefix": str(venv_path.resolve()),
+        # Scripts may carry the unresolved spelling if the venv sits under a symlink
+        "prefixes": core.path_forms(venv_path),
+        "name": venv_path.name,
+        "platform": sys.platform,
+        "envtool": __version__,
+    }).encode()
+
+    to_stdout = str(output) == "-"
+    mode = f"w|{_compression_for('' if to_stdout else output)}"
+    fileobj = sys.stdout.buffer if to_stdout else open(output, "wb")
+    # Status lines go to stderr when the archive itself is on stdout
+    log = Console(stderr=True) if to_stdout else core.console
+
+    try:
+        with core.env_lock(venv_path, shared=True), log.status(f"[bold yellow]Packing {venv_path.name}...", spinner="dots"):
+            with tarfile.open(fileobj=fileobj, mode=mode) as tar:
+                info = tarfile.TarInfo(MANIFEST_NAME)
+                info.size = len(manifest)
+                tar.addfile(info, io.BytesIO(manifest))
+                for entry in sorted(venv_path.iterdir()):
+                    tar.add(entry, arcname=entry.name, filter=_filter)
+    finally:
+        if not to_stdout:
+            fileobj.close()
+
+    if not to_stdout:
+        size_mb = Path(output).stat().st_size / (1024 * 1024)
+        log.print(f"✅ Packed [bold cyan]{venv_path.name}[/bold cyan] → {output} ({size_mb:.1f} MB)")
+    return True
+
+def _relink(venv_path, old_prefix, new_prefix):
+    """Retarget absolute symlinks that pointed inside the packed venv."""
+    for root, dirs, files in os.walk(venv_path):
+        for name in dirs + files:
+            p = Path(root) / name
+            if p.is_symlink():
+                link = os.readlink(p)
+                if link.startswith(old_prefix):
+                    p.unlink()
+                    os.symlink(new_prefix + link[len(old_prefix):], p)
+
+def unpack_venv(archive, dest=None, global_name=None):
+    """Stream-extract a packed venv and rewrite its absolute paths for the new location. Use '-' to read stdin."""
+    if global_name:
+        if not core.is_valid_env_name(global_name):
+            core.console.print(f"[bold red]Error:[/bold red] Invalid environment name '{global_name}'.")
+            return False
+        core.GLOBAL_ENV_BASE.mkdir(parents=True, exist_ok=True)
+        target_path = core.GLOBAL_ENV_BASE / global_name
+    else:
+        target_path = Path(dest) if dest else Path.cwd() / core.ENV_NAME
+
+    from_stdin = str(archive) == "-"
+    fileobj = sys.stdin.buffer if from_stdin else open(archive, "rb")
+    extract_kwargs = {"filter": "tar"} if hasattr(tarfile, "tar_filter") else {}
+
+    try:
+        with core.env_lock(target_path):
+            if target_path.exists():
+                core.console.print(f"[yellow]Destination '{target_path}' already exists.[/yellow]")
+                return False
+
+            tmp_path = target_path.parent / f".{target_path.name}.tmp-{os.getpid()}"
+            if tmp_path.exists():
+                shutil.rmtree(tmp_path)
+            tmp_path.mkdir(parents=True)
+            manifest = None
+            try:
+                with core.console.status(f"[bold yellow]Unpacking into {target_path.name}...", spinner="dots"):
+                    with tarfile.open(fileobj=fileobj, mode="r|*") as tar:
+                        for member in tar:
+                            if member.name == MANIFEST_NAME:
+                                manifest = json.loads(tar.extractfile(member).read())
+                                continue
+                            tar.extract(member, tmp_path, **extract_kwargs)
+
+                    if manifest is None:
+                        raise ValueError("archive was not created by 'env pack' (missing manifest)")
+                    new_prefix = str(target_path.resolve())
+                    old_prefixes = manifest.get("prefixes") or [manifest["prefix"]]
+                    core.rewrite_venv_paths(tmp_path, old_prefixes, new_prefix)
+                    for old_prefix in old_prefixes:
+                        _relink(tmp_path, old_prefix, new_prefix)
+                    os.rename(tmp_path, target_path)
+            except Exception as e:
+                shutil.rmtree(tmp_path, ignore_errors=True)
+                if core.DEBUG_MODE: core.console.print_exception()
+                core.console.print(f"[bold red]Error:[/bold red] Failed to unpack: {e}")
+                return False
+            except BaseException:
+                shutil.rmtree(tmp_path, ignore_errors=True)
+                raise
+    finally:
+        if not from_stdin:
+            fileobj.close()
+
+    if manifest.get("platform") != sys.platform:
+        core.console.print(f"[yellow]Warning: archive was packed on {manifest.get('platform')}, this is {sys.platform}.[/yellow]")
+    core.console.print(f"✅ Unpacked [bold cyan]{manifest.get('name')}[/bold cyan] → {target_path}")
+    return True
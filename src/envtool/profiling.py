@@ -0,0 +1,169 @@
+import re
+import sys
+import json
+import time
+import subprocess
+from pathlib import Path
+from rich.table import Table
+from envtool import core
+
+PROFILE_DIR_NAME = ".envtool-profiles"
+RUNNER = Path(__file__).with_name("_profile_runner.py")
+SENTINEL = "envtool-profile: start"
+END_SENTINEL = "envtool-profile: end"
+IMPORT_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+def parse_importtime(lines):
+    """Parse `-X importtime` lines into [{'module', 'self_us', 'cumulative_us', 'depth'}]."""
+    imports = []
+    for line in lines:
+        m = IMPORT_RE.match(line)
+        if m:
+            imports.append({
+                "module": m.group(4),
+                "self_us": int(m.group(1)),
+                "cumulative_us": int(m.group(2)),
+                "depth": (len(m.group(3)) - 1) // 2,
+            })
+    return imports
+
+def _target_slug(target):
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", target).strip("_") or "target"
+
+def _previous_run(profile_dir, slug, mode):
+    """Most recent saved summary for the same target and mode, for delta columns."""
+    runs = sorted(profile_dir.glob(f"*-{slug}-{mode}.json"))
+    for path in reversed(runs):
+        try:
+            return json.loads(path.read_text())
+        except (OSError, ValueError):
+            continue
+    return None
+
+def _delta(now, before):
+    if before is None:
+        return ""
+    diff = now - before
+    colour = "red" if diff > 0 else "green"
+    return f"[{colour}]{diff:+.3f}s[/{colour}]"
+
+def _short_location(fn):
+    filename = fn["file"]
+    if filename.startswith("~") or filename.startswith("<"):
+        return f"{filename}:{fn['function']}" if filename != "~" else fn["function"]
+    try:
+        filename = str(Path(filename).relative_to(Path.cwd()))
+    except ValueError:
+        parts = Path(filename).parts
+        if "site-packages" in parts:
+            filename = "/".join(parts[parts.index("site-packages") + 1:])
+        else:
+            filename = Path(filename).name
+    return f"{filename}:{fn['line']}({fn['function']})"
+
+def profile_target(target, args=(), module=False, sample=False, interval=0.005, top=20, imports=True):
+    """Run a script or module under the venv interpreter with cProfile (or sampling) and -X importtime"""
+    python_exe = core.get_python_exe()
+    if not python_exe.exists():
+        core.console.print("[bold red]Venv not detected.[/bold red] Run 'env' to create one first.")
+        return False
+
+    # Same .env handling as run_in_venv
+    core.load_env()
+
+    mode = "sample" if sample else "profile"
+    slug = _target_slug(target)
+    profile_dir = Path.cwd() / PROFILE_DIR_NAME
+    profile_dir.mkdir(exist_ok=True)
+    previous = _previous_run(profile_dir, slug, mode)
+    out_prefix = profile_dir / f"{time.strftime('%Y%m%d-%H%M%S')}-{slug}-{mode}"
+
+    cmd = [str(python_exe)]
+    if imports:
+        cmd += ["-X", "importtime"]
+    cmd += ["-c", RUNNER.read_text(), str(out_prefix), mode, str(interval),
+            "module" if module else "script", target] + list(args)
+    if core.DEBUG_MODE:
+        core.console.print(f"[dim]Executing: {python_exe} -X importtime <runner> {target} {' '.join(args)}[/dim]")
+
+    core.console.print(f"[dim]Profiling {target} ({mode} mode)...[/dim]\n")
+    with core.env_lock(core.get_venv_path(), shared=True):
+        # stdout goes straight to the terminal; stderr is captured to split out importtime lines
+        proc = subprocess.run(cmd, stderr=subprocess.PIPE, text=True)
+
+    stderr_lines = proc.stderr.splitlines()
+    started = SENTINEL in stderr_lines
+    after = stderr_lines[stderr_lines.index(SENTINEL) + 1:] if started else stderr_lines
+    during = after[:after.index(END_SENTINEL)] if END_SENTINEL in after else after
+    program_stderr = [l for l in after if l != END_SENTINEL and not IMPORT_RE.match(l)]
+    if program_stderr:
+        sys.stderr.write("\n".join(program_stderr) + "\n")
+
+    summary_file = Path(f"{out_prefix}.json")
+    if not summary_file.exists():
+        core.console.print("[bold red]Error:[/bold red] Profiler produced no output.")
+        return False
+    summary = json.loads(summary_file.read_text())
+    # Only imports triggered by the target, not by the runner's own setup
+    summary["imports"] = parse_importtime(during) if imports else []
+    summary["target"] = target
+    summary["args"] = list(args)
+    summary_file.write_text(json.dumps(summary))
+
+    _render(summary, previous, top)
+    saved = [summary_file.name] + ([f"{out_prefix.name}.pstats"] if mode == "profile" else [])
+    core.console.print(f"\n[dim]Saved {', '.join(saved)} in {PROFILE_DIR_NAME}/[/dim]")
+    if summary["exit_code"]:
+        core.console.print(f"[yellow]Target exited with status {summary['exit_code']}.[/yellow]")
+    return summary["exit_code"] == 0
+
+def _render(summary, previous, top):
+    prev_funcs = {}
+    if previous:
+        prev_funcs = {(f["file"], f["line"], f["function"]): f for f in previous.get("functions", [])}
+
+    title = "🔥 [bold red]Hottest Functions[/bold red]"
+    if summary["mode"] == "sample":
+        title += " [dim](sampled)[/dim]"
+    table = Table(title=title, box=None)
+    table.add_column("Function", style="cyan", overflow="fold")
+    table.add_column("Calls", justify="right", style="dim")
+    table.add_column("Self", justify="right")
+    table.add_column("Cumulative", justify="right")
+    if previous:
+        table.add_column("Δ cum", justify="right")
+
+    functions = sorted(summary["functions"], key=lambda f: f["tottime"], reverse=True)[:top]
+    for fn in functions:
+        row = [_short_location(fn), "-" if fn["calls"] is None else str(fn["calls"]),
+               f"{fn['tottime']:.3f}s", f"{fn['cumtime']:.3f}s"]
+        if previous:
+            before = prev_funcs.get((fn["file"], fn["line"], fn["function"]))
+            row.append(_delta(fn["cumtime"], before["cumtime"] if before else None))
+        table.add_row(*row)
+    core.console.print(table)
+
+    if summary["imports"]:
+        prev_imports = {i["module"]: i for i in (previous or {}).get("imports", [])}
+        imp_table = Table(title="📦 [bold yellow]Slowest Imports[/bold yellow]", box=None)
+        imp_table.add_column("Module", style="cyan")
+        imp_table.add_column("Self", justify="right")
+        imp_table.add_column("Cumulative", justify="right")
+        if prev_imports:
+            imp_table.add_column("Δ cum", justify="right")
+        for imp in sorted(summary["imports"], key=lambda i: i["cumulative_us"], reverse=True)[:top]:
+            row = [("  " * imp["depth"]) + imp["module"], f"{imp['self_us'] / 1000:.1f}ms", f"{imp['cumulative_us'] / 1000:.1f}ms"]
+            if prev_imports:
+                before = prev_imports.get(imp["module"])
+                row.append(_delta(imp["cumulative_us"] / 1e6, before["cumulative_us"] / 1e6 if before else None))
+            imp_table.add_row(*row)
+        core.console.print(imp_table)
+        total_ms = sum(i["self_us"] for i in summary["imports"]) / 1000
+        core.console.print(f"[dim]Total import time: {total_ms:.1f}ms across {len(summary['imports'])} modules[/dim]")
+    if summary.get("preloaded"):
+        core.console.print(f"[dim]Already imported by the profiler (not timed): {', '.join(summary['preloaded'])}[/dim]")
+
+    wall = f"Wall time: [bold]{summary['wall']:.3f}s[/bold]"
+    if previous:
+        wall += f" ({_delta(summary['wall'], previous.get('wall'))} vs last run)"
+    core.console.print(wall)
@@ -0,0 +1,229 @@
+import os
+import re
+import sys
+import time
+import tempfile
+import subprocess
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from rich.table import Table
+from rich.panel import Panel
+from envtool import api, core, pythons, shared_pip, sync
+
+if sys.version_info >= (3, 11):
+    import tomllib
+else:
+    import tomli as tomllib
+
+# Wheels downloaded or built for one env are installed into every other env that needs them.
+# Each Python version gets its own subdirectory. Wheels only ever arrive by atomic rename, so
+# envs can read it while others add to it without any locking.
+WHEELHOUSE = Path.home() / ".envtool" / "wheelhouse"
+
+def load_manifest(path):
+    """Read an envs.toml manifest into a list of env specs.
+
+    Each env is a table under [envs]; keys are `python`, `requirements` (a list of requirement
+    lines, or a path to a requirements file relative to the manifest) and `pip` (false for a
+    pip-less env). A [defaults] table supplies values for every env.
+    """
+    path = Path(path)
+    with open(path, "rb") as f:
+        data = tomllib.load(f)
+    defaults = data.get("defaults", {})
+    envs = data.get("envs", {})
+    if not isinstance(envs, dict) or not envs:
+        raise ValueError(f"{path.name} defines no [envs.<name>] tables.")
+
+    specs = []
+    if not isinstance(defaults, dict):
+        raise ValueError("[defaults] must be a table.")
+    for name, body in envs.items():
+        if not core.is_valid_env_name(name):
+            raise ValueError(f"Invalid environment name '{name}'.")
+        if not isinstance(body, dict):
+            raise ValueError(f"envs.{name} must be a table.")
+        body = dict(defaults, **body)
+        requirements = body.get("requirements", [])
+        if isinstance(requirements, str):
+            requirements = path.parent / requirements
+        elif not isinstance(requirements, list):
+            raise ValueError(f"envs.{name}.requirements must be a list or a file path.")
+        specs.append({
+            "name": name,
+            "python": body.get("python"),
+            "requirements": requirements,
+            "with_pip": body.get("pip", not shared_pip.pipless_requested()),
+        })
+    return specs
+
+def _requirements_file(spec, workdir):
+    """Requirements for an env as a file, writing inline lists out so sync can parse them."""
+    if isinstance(spec["requirements"], Path):
+        return spec["requirements"]
+    req_file = Path(workdir) / f"{spec['name']}.txt"
+    req_file.write_text("".join(f"{line}\n" for line in spec["requirements"]))
+    return req_file
+
+def _env_python_version(venv_path):
+    try:
+        for line in (Path(venv_path) / "pyvenv.cfg").read_text().splitlines():
+            key, _, value = line.partition("=")
+            if key.strip() in ("version", "version_info"):
+                return value.strip()
+    except OSError:
+        pass
+    return None
+
+def _python_matches(venv_path, spec, interpreter):
+    """Whether an existing env was built from the interpreter the manifest asks for."""
+    have = _env_python_version(venv_path)
+    if not spec or not have:
+        return True
+    want = re.sub(r"^(python|py)", "", spec.lower())
+    if re.fullmatch(r"\d+(\.\d+){0,2}", want):
+        # '3.11' accepts any 3.11.x, like --python does
+        parts = want.split(".")
+    else:
+        known = {p["executable"]: p["version"] for p in pythons.discover_pythons()}
+        version = known.get(os.path.realpath(interpreter))
+        if not version:
+            return True
+        parts = version.split(".")[:3]
+    return have.split(".")[:len(parts)] == parts
+
+def plan_env(spec, req_file, prune=False):
+    """Decide what an env needs: 'missing', 'rebuild' (wrong interpreter), 'drifted' or 'ok'.
+
+    Returns (status, interpreter, changes). Editable/URL requirements cannot be compared,
+    so they are only installed when the env is (re)built.
+    """
+    interpreter = pythons.resolve_python(spec["python"]) if spec["python"] else None
+    if spec["python"] and not interpreter:
+        raise ValueError(f"No Python interpreter matching '{spec['python']}' found.")
+
+    venv_path = core.GLOBAL_ENV_BASE / spec["name"]
+    python_exe = api.python_exe_for(venv_path)
+    if not python_exe.exists():
+        return "missing", interpreter, []
+    if not _python_matches(venv_path, spec["python"], interpreter):
+        return "rebuild", interpreter, [f"python {_env_python_version(venv_path)}"]
+
+    with core.env_lock(venv_path, shared=True, quiet=True):
+        to_install, to_remove, _ = sync.compute_sync_plan(req_file, venv_path, python_exe)
+    changes = [f"+{r}" for r in to_install] + ([f"-{n}" for n in to_remove] if prune else [])
+    return ("drifted" if changes else "ok"), interpreter, changes
+
+def _wheelhouse_for(venv_path):
+    """Wheelhouse directory for the env's Python version (major.minor)."""
+    version = _env_python_version(venv_path) or "unknown"
+    return WHEELHOUSE / f"py{'.'.join(version.split('.')[:2])}"
+
+def _pip(venv_path, args):
+    return subprocess.run(shared_pip.pip_command(venv_path) + args, check=True, capture_output=True, text=True)
+
+def apply_env(spec, status, interpreter, req_file, prune=False):
+    """Build or update one global env from its manifest entry. Returns seconds taken."""
+    start = time.perf_counter()
+    venv_path = core.GLOBAL_ENV_BASE / spec["name"]
+    with core.env_lock(venv_path, quiet=True):
+        if status in ("missing", "rebuild"):
+            # A rebuild only replaces the old env once the new one has been built
+            core.build_venv_atomic(venv_path, with_pip=spec["with_pip"], python=interpreter, replace=status == "rebuild")
+
+        parsed = sync.parse_requirements(req_file)
+        if parsed["requirements"] or parsed["unmanaged"]:
+            wheelhouse = _wheelhouse_for(venv_path)
+            wheelhouse.mkdir(parents=True, exist_ok=True)
+            req = ["-r", str(req_file)]
+            links = ["--find-links", str(wheelhouse)]
+            try:
+                # Each env fetches and builds into its own scratch dir (reusing wheels already in the
+                # wheelhouse), so envs don't wait on each other; new wheels are then renamed in
+                with tempfile.TemporaryDirectory(prefix=".build-", dir=wheelhouse) as scratch:
+                    _pip(venv_path, ["wheel", "-q", "-w", scratch] + links + req)
+                    for wheel in Path(scratch).glob("*.whl"):
+                        if not (wheelhouse / wheel.name).exists():
+                            os.replace(wheel, wheelhouse / wheel.name)
+                _pip(venv_path, ["install", "-q", "--no-index"] + links + req)
+            except subprocess.CalledProcessError:
+                # Anything the wheelhouse could not provide comes from the index as usual
+                _pip(venv_path, ["install", "-q"] + links + req)
+
+        if prune:
+            _, to_remove, _ = sync.compute_sync_plan(req_file, venv_path, api.python_exe_for(venv_path))
+            if to_remove:
+                _pip(venv_path, ["uninstall", "-y", "-q"] + to_remove)
+    return time.perf_counter() - start
+
+def apply_manifest(manifest, jobs=None, dry_run=False, prune=False):
+    """Bring the global store in line with a manifest, building missing or drifted envs in parallel"""
+    try:
+        specs = load_manifest(manifest)
+    except (OSError, ValueError, tomllib.TOMLDecodeError) as e:
+        core.console.print(f"[bold red]Error:[/bold red] {e}")
+        return False
+
+    core.GLOBAL_ENV_BASE.mkdir(parents=True, exist_ok=True)
+    jobs = jobs or min(len(specs), os.cpu_count() or 4)
+    if any(s["python"] for s in specs):
+        # Probe interpreters once up front so the planning threads only read the cache
+        pythons.discover_pythons()
+    with tempfile.TemporaryDirectory(prefix="envtool-apply-") as workdir:
+        req_files = {s["name"]: _requirements_file(s, workdir) for s in specs}
+
+        plans, failed = {}, {}
+        with core.console.status(f"[bold yellow]Checking {len(specs)} environments...", spinner="dots"):
+            with ThreadPoolExecutor(max_workers=jobs) as pool:
+                futures = {pool.submit(plan_env, s, req_files[s["name"]], prune): s["name"] for s in specs}
+                for future in as_completed(futures):
+                    try:
+                        plans[futures[future]] = future.result()
+                    except Exception as e:
+                        failed[futures[future]] = str(e)
+
+        todo = [s for s in specs if s["name"] in plans and plans[s["name"]][0] != "ok"]
+        timings = {}
+        if todo and not dry_run:
+            with core.console.status(f"[bold yellow]Provisioning {len(todo)} environments...", spinner="dots") as status:
+                with ThreadPoolExecutor(max_workers=jobs) as pool:
+                    futures = {
+                        pool.submit(apply_env, s, plans[s["name"]][0], plans[s["name"]][1], req_files[s["name"]], prune): s["name"]
+                        for s in todo
+                    }
+                    for done, future in enumerate(as_completed(futures), 1):
+                        name = futures[future]
+                        try:
+                            timings[name] = future.result()
+                        except subprocess.CalledProcessError as e:
+                            failed[name] = (e.stderr or e.stdout or str(e)).strip()
+                        except Exception as e:
+                            failed[name] = str(e)
+                        status.update(f"[bold yellow]Provisioning environments... ({done}/{len(todo)})")
+
+    labels = {"missing": "created", "rebuild": "rebuilt", "drifted": "updated"}
+    if dry_run:
+        labels = {"missing": "will create", "rebuild": "will rebuild", "drifted": "will update"}
+    table = Table(title="🌍 [bold green]Manifest Apply[/bold green]", box=None)
+    table.add_column("Env", style="cyan")
+    table.add_column("Python", style="dim")
+    table.add_column("Status")
+    table.add_column("Changes", style="dim", overflow="fold")
+    table.add_column("Time", justify="right", style="dim")
+    for spec in specs:
+        name = spec["name"]
+        state, _, changes = plans.get(name, ("", None, []))
+        summary = ", ".join(changes[:5]) + (f" (+{len(changes) - 5} more)" if len(changes) > 5 else "")
+        if name in failed:
+            row = ["[red]FAILED[/red] ❌", summary, "-"]
+        elif state == "ok":
+            row = ["[green]up to date[/green]", "", "-"]
+        else:
+            seconds = f"{timings[name]:.1f}s" if name in timings else "-"
+            row = [f"[yellow]{labels[state]}[/yellow]", summary, seconds]
+        table.add_row(name, spec["python"] or "default", *row)
+
+    for name, error in sorted(failed.items()):
+        core.console.print(Panel(error[-3000:], title=name, border_style="red"))
+    core.console.print(table)
+    return not failed
@@ -0,0 +1,225 @@
+import os
+import re
+import ast
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from packaging.requirements import Requirement, InvalidRequirement
+from packaging.utils import canonicalize_name
+from rich.table import Table
+from envtool import api, core, sync
+
+SCAN_DIRS = ["src", "tests"]
+SKIP_DIRS = {"__pycache__", ".git", ".tox", ".nox", "node_modules", "build", "dist", ".envtool-profiles"}
+# Files below this count are parsed inline; a process pool only pays off for bigger trees
+PARALLEL_THRESHOLD = 50
+
+def _top_levels_from_record(dist_info):
+    """Derive importable top-level names from RECORD when top_level.txt is missing."""
+    names = set()
+    try:
+        lines = (dist_info / "RECORD").read_text(encoding="utf-8", errors="replace").splitlines()
+    except OSError:
+        return names
+    for line in lines:
+        path = line.split(",", 1)[0]
+        if not path or path.startswith("..") or "/" not in path and not path.endswith((".py", ".so", ".pyd")):
+            continue
+        first = path.split("/", 1)[0]
+        if first.endswith((".dist-info", ".data")) or first == "__pycache__":
+            continue
+        name = first.split(".", 1)[0]
+        if name.isidentifier():
+            names.add(name)
+    return names
+
+def build_import_index(venv_path):
+    """Map top-level import name -> set of canonical distribution names installed in the venv.
+
+    Also returns the set of distributions that ship console scripts (tools people run rather than import).
+    """
+    index, tools = {}, set()
+    site_packages = sync.get_site_packages(venv_path)
+    if not site_packages or not site_packages.exists():
+        return index, tools
+
+    for dist_info in site_packages.glob("*.dist-info"):
+        meta = sync._read_metadata(dist_info)
+        if not meta or not meta[0]:
+            continue
+        dist = canonicalize_name(meta[0])
+        top_level = dist_info / "top_level.txt"
+        if top_level.exists():
+            names = {l.strip().split("/")[0] for l in top_level.read_text().splitlines() if l.strip()}
+        else:
+            names = _top_levels_from_record(dist_info)
+        for name in names:
+            index.setdefault(name, set()).add(dist)
+        entry_points = dist_info / "entry_points.txt"
+        if entry_points.exists() and "[console_scripts]" in entry_points.read_text(errors="replace"):
+            tools.add(dist)
+    return index, tools
+
+def scan_file_imports(path):
+    """Top-level module names imported by one file (absolute imports and literal import_module calls)."""
+    try:
+        tree = ast.parse(Path(path).read_bytes(), filename=str(path))
+    except (SyntaxError, ValueError, OSError):
+        return set()
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name.split(".")[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            if node.module and not node.level:
+                names.add(node.module.split(".")[0])
+        elif isinstance(node, ast.Call) and node.args and isinstance(node.args[0], ast.Constant):
+            func = node.func
+            fname = func.attr if isinstance(func, ast.Attribute) else getattr(func, "id", None)
+            if fname in ("import_module", "__import__") and isinstance(node.args[0].value, str):
+                names.add(node.args[0].value.split(".")[0])
+    return names
+
+def _scan_chunk(paths):
+    found = set()
+    for p in paths:
+        found |= scan_file_imports(p)
+    return found
+
+def project_python_files(project, dirs=None):
+    """Python files in src/ and tests/ plus top-level scripts of the project."""
+    project = Path(project)
+    files = [p for p in project.glob("*.py") if p.is_file()]
+    for d in (dirs or SCAN_DIRS):
+        root = project / d
+        if not root.is_dir():
+            continue
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = [n for n in dirnames if n not in SKIP_DIRS and not n.startswith(".")]
+            files.extend(Path(dirpath) / f for f in filenames if f.endswith(".py"))
+    return files
+
+def scan_project_imports(files, workers=None):
+    """Union of imports across files, parsed in a process pool for larger trees."""
+    if len(files) < PARALLEL_THRESHOLD:
+        return _scan_chunk(files)
+    workers = workers or os.cpu_count() or 4
+    chunk = max(1, len(files) // (workers * 4))
+    chunks = [files[i:i + chunk] for i in range(0, len(files), chunk)]
+    found = set()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for names in pool.map(_scan_chunk, chunks):
+            found |= names
+    return found
+
+def local_module_names(project, files, dirs=None):
+    """Names that resolve to the project itself (its own packages/modules), not to a distribution."""
+    local = set()
+    project = Path(project)
+    roots = [project / d for d in (dirs or SCAN_DIRS)]
+    for f in files:
+        # Packages live directly under whichever scan root the file came from
+        root = max((r for r in roots if r in f.parents), key=lambda r: len(r.parts), default=project)
+        local.add(Path(f.relative_to(root).parts[0]).stem)
+    return local
+
+def analyse(project=None, dirs=None, include_tools=False, keep=()):
+    """Work out which top-level requirements nothing in the project imports.
+
+    Returns a dict with 'unused' (requirement names), 'tools' (console-script-only requirements
+    kept unless include_tools), 'used', 'files' (count) and 'parsed' (the parsed requirements).
+    """
+    project = Path(project or Path.cwd())
+    venv_path = api.resolve_venv(project).path
+    parsed = sync.parse_requirements(project / "requirements.txt")
+
+    index, tool_dists = build_import_index(venv_path)
+    files = project_python_files(project, dirs)
+    imports = scan_project_imports(files) - local_module_names(project, files, dirs)
+
+    dists_by_import = {}
+    for name in imports:
+        for dist in index.get(name, {canonicalize_name(name)}):
+            dists_by_import.setdefault(dist, set()).add(name)
+
+    installed = sync.scan_installed(venv_path)
+    roots = parsed["requirements"]
+    keep = {canonicalize_name(k) for k in keep} | sync.PROTECTED
+    directly_used = [r for r in roots if canonicalize_name(r.name) in dists_by_import or canonicalize_name(r.name) in keep]
+    # Frozen requirement files list transitive deps too; anything a used package needs stays
+    python_exe = api.python_exe_for(venv_path)
+    marker_env = sync.get_marker_environment(python_exe) if python_exe.exists() else None
+    needed = sync.reachable_from(directly_used, installed, marker_env) | {canonicalize_name(r.name) for r in directly_used}
+
+    unused, tools = [], []
+    for r in roots:
+        name = canonicalize_name(r.name)
+        if name in needed:
+            continue
+        if name in tool_dists and not include_tools:
+            tools.append(r.name)
+        else:
+            unused.append(r.name)
+    return {"unused": unused, "tools": tools, "used": sorted(r.name for r in directly_used),
+            "files": len(files), "parsed": parsed}
+
+def rewrite_requirements(files, drop):
+    """Remove requirement lines naming any distribution in `drop` from the given files."""
+    drop = {canonicalize_name(d) for d in drop}
+    changed = []
+    for path in files:
+        if not Path(path).exists():
+            continue
+        lines = Path(path).read_text().splitlines(keepends=True)
+        kept, skipping = [], False
+        for line in lines:
+            # A dropped requirement takes its backslash-continued --hash lines with it
+            if skipping:
+                skipping = line.rstrip().endswith("\\")
+                continue
+            body = re.sub(r"(^|\s)#.*$", "", line).strip().rstrip("\\").strip()
+            body = re.sub(r"\s*--hash[=\s]\S+", "", body)
+            try:
+                if body and not body.startswith("-") and canonicalize_name(Requirement(body).name) in drop:
+                    skipping = line.rstrip().endswith("\\")
+                    continue
+            except InvalidRequirement:
+                pass
+            kept.append(line)
+        if kept != lines:
+            Path(path).write_text("".join(kept))
+            changed.append(Path(path))
+    return changed
+
+def prune_report(write=False, include_tools=False, keep=(), dirs=None):
+    """Report (and optionally drop) requirements that no project code imports"""
+    if not (Path.cwd() / "requirements.txt").exists():
+        core.console.print("[red]requirements.txt not found. Run 'env freeze' first.[/red]")
+        return False
+
+    with core.console.status("[bold yellow]Indexing imports...", spinner="dots"):
+        result = analyse(dirs=dirs, include_tools=include_tools, keep=keep)
+
+    core.console.print(f"[dim]Scanned {result['files']} files; {len(result['used'])} requirements imported directly.[/dim]")
+    if not result["unused"] and not result["tools"]:
+        core.console.print("✅ [bold green]Every requirement is referenced.[/bold green]")
+        return True
+
+    table = Table(title="✂️  [bold yellow]Unreferenced Requirements[/bold yellow]", box=None)
+    table.add_column("Package", style="cyan")
+    table.add_column("Status")
+    for name in result["unused"]:
+        table.add_row(name, "[red]unused[/red]")
+    for name in result["tools"]:
+        table.add_row(name, "[dim]CLI tool, kept (use --include-tools)[/dim]")
+    core.console.print(table)
+
+    if not result["unused"]:
+        return True
+    if write:
+        changed = rewrite_requirements(result["parsed"]["files"], result["unused"])
+        names = ", ".join(p.name for p in changed)
+        core.console.print(f"✅ Removed {len(result['unused'])} requirements from {names}.")
+        core.console.print("Run [bold cyan]env sync[/bold cyan] to uninstall them from the venv.")
+    else:
+        core.console.print("[dim]Run with --write to drop them from requirements.txt.[/dim]")
+    return True
@@ -0,0 +1,155 @@
+import os
+import re
+import sys
+import json
+import glob
+import subprocess
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from rich.table import Table
+from envtool import core
+
+CACHE_FILE = Path.home() / ".envtool" / "pythons.json"
+EXE_PATTERN = re.compile(r"^python(\d(\.\d+)?)?(\.exe)?$" if sys.platform == "win32" else r"^python(\d(\.\d+)?)?$")
+
+PROBE_SCRIPT = (
+    "import sys, json, sysconfig, platform;"
+    "print(json.dumps({'version': platform.python_version(),"
+    " 'implementation': sys.implementation.name,"
+    " 'abi': sysconfig.get_config_var('SOABI') or sysconfig.get_config_var('EXT_SUFFIX') or '',"
+    " 'has_venv': __import__('importlib.util').util.find_spec('venv') is not None}))"
+)
+
+def _candidate_paths():
+    """Yield possible interpreter binaries from PATH, pyenv, asdf and system locations."""
+    dirs = [d for d in os.environ.get("PATH", "").split(os.pathsep) if d]
+    # Shims pick a version from the cwd; scan the real installs behind them instead
+    dirs = [d for d in dirs if "shims" not in Path(d).parts]
+
+    pyenv_root = os.environ.get("PYENV_ROOT", str(Path.home() / ".pyenv"))
+    asdf_root = os.environ.get("ASDF_DATA_DIR", str(Path.home() / ".asdf"))
+    dirs += glob.glob(os.path.join(pyenv_root, "versions", "*", "bin"))
+    dirs += glob.glob(os.path.join(asdf_root, "installs", "python", "*", "bin"))
+    if sys.platform != "win32":
+        dirs += ["/usr/bin", "/usr/local/bin", "/opt/homebrew/bin"]
+
+    for d in dirs:
+        try:
+            entries = os.listdir(d)
+        except OSError:
+            continue
+        for name in entries:
+            if EXE_PATTERN.match(name):
+                yield Path(d) / name
+
+def _load_cache():
+    try:
+        return json.loads(CACHE_FILE.read_text())
+    except (OSError, ValueError):
+        return {}
+
+def _save_cache(cache):
+    try:
+        CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp = CACHE_FILE.with_suffix(f".tmp-{os.getpid()}")
+        tmp.write_text(json.dumps(cache, indent=2))
+        os.replace(tmp, CACHE_FILE)
+    except OSError as e:
+        if core.DEBUG_MODE: core.console.print(f"[dim]Failed to save interpreter cache: {e}[/dim]")
+
+def _probe(real_path):
+    try:
+        result = subprocess.run([real_path, "-c", PROBE_SCRIPT], capture_output=True, text=True, timeout=10)
+        if result.returncode == 0:
+            return json.loads(result.stdout)
+    except (OSError, ValueError, subprocess.TimeoutExpired):
+        pass
+    return None
+
+def discover_pythons():
+    """Return every interpreter found, one entry per real binary, newest version first.
+
+    Version/ABI info is cached in ~/.envtool/pythons.json keyed on the binary's mtime,
+    so only new or changed interpreters are actually executed.
+    """
+    cache = _load_cache()
+    found = {}
+    for path in _candidate_paths():
+        try:
+            real = os.path.realpath(path)
+            mtime = os.stat(real).st_mtime_ns
+        except OSError:
+            continue
+        if real not in found:
+            found[real] = {"path": str(path), "mtime": mtime}
+
+    stale = [real for real, info in found.items() if cache.get(real, {}).get("mtime") != info["mtime"]]
+    if stale:
+        with ThreadPoolExecutor(max_workers=min(8, len(stale))) as pool:
+            for real, probed in zip(stale, pool.map(_probe, stale)):
+                cache[real] = dict(probed, mtime=found[real]["mtime"]) if probed else {"mtime": found[real]["mtime"], "invalid": True}
+        _save_cache(cache)
+
+    pythons = []
+    for real, info in found.items():
+        entry = cache.get(real, {})
+        if entry.get("invalid") or "version" not in entry:
+            continue
+        pythons.append(dict(entry, executable=real, path=info["path"]))
+    pythons.sort(key=lambda p: version_key(p["version"]), reverse=True)
+    return pythons
+
+def version_key(version):
+    return tuple(int(x) for x in re.findall(r"\d+", version)[:3])
+
+def resolve_python(spec):
+    """Turn a --python value ('3.11', 'python3.11', or a path) into an interpreter path, or None."""
+    if not spec:
+        return None
+    as_path = Path(spec).expanduser()
+    if as_path.exists() and as_path.is_file():
+        return str(as_path)
+
+    wanted = spec.lower()
+    for prefix in ("python", "py"):
+        if wanted.startswith(prefix):
+            wanted = wanted[len(prefix):]
+            break
+    if not re.fullmatch(r"\d+(\.\d+){0,2}", wanted):
+        return None
+
+    parts = wanted.split(".")
+    for py in discover_pythons():
+        if py["version"].split(".")[:len(parts)] == parts and py.get("has_venv", True):
+            return py["executable"]
+    return None
+
+def get_selected_python():
+    """Interpreter requested with --python (stored in ENVTOOL_PYTHON), or None for the running one."""
+    spec = os.environ.get("ENVTOOL_PYTHON")
+    if not spec:
+        return None
+    resolved = resolve_python(spec)
+    if resolved is None:
+        raise ValueError(f"No Python interpreter matching '{spec}' found. Run 'env pythons' to list them.")
+    return resolved
+
+def list_pythons():
+    """Display all discovered interpreters"""
+    with core.console.status("[dim]Scanning for interpreters...", spinner="dots"):
+        pythons = discover_pythons()
+
+    if not pythons:
+        core.console.print("[dim]No Python interpreters found.[/dim]")
+        return
+
+    current = os.path.realpath(sys.executable)
+    table = Table(title="🐍 [bold green]Python Interpreters[/bold green]", box=None)
+    table.add_column("Version", style="cyan")
+    table.add_column("Impl", style="dim")
+    table.add_column("ABI", style="dim")
+    table.add_column("Path")
+    for py in pythons:
+        marker = " [green](current)[/green]" if py["executable"] == current else ""
+        table.add_row(py["version"], py["implementation"], py["abi"], f"{py['path']}{marker}")
+    core.console.print(table)
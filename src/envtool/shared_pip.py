@@ -0,0 +1,92 @@
+import os
+import sys
+import json
+import time
+import subprocess
+from pathlib import Path
+from envtool import api, core
+
+TOOL_ENV = Path.home() / ".envtool" / "tool"
+# One pip for every pip-less env; bumped here rather than upgraded per env.
+# 24.2 is the newest release that still runs on Python 3.8.
+PIP_VERSION = "24.2"
+# `pip --python` first shipped in pip 22.3
+MIN_PIP_VERSION = "22.3"
+# A failed upgrade is recorded here and not retried for a day, so offline machines don't pay
+# a connectivity probe on every pip call
+ATTEMPT_FILE = TOOL_ENV / ".pip-upgrade-attempt"
+RETRY_SECONDS = 24 * 60 * 60
+
+class SharedPipError(Exception):
+    """Raised when the shared pip can't drive pip-less envs."""
+
+def pipless_requested():
+    """True when new envs should be created without their own pip (--no-pip or ENVTOOL_NO_PIP=1)."""
+    return os.environ.get("ENVTOOL_NO_PIP", "").lower() in ("1", "true", "yes")
+
+def has_own_pip(venv_path):
+    from envtool import sync
+    site_packages = sync.get_site_packages(venv_path)
+    return bool(site_packages) and (site_packages / "pip").is_dir()
+
+def tool_python():
+    return api.python_exe_for(TOOL_ENV)
+
+def shared_pip_version():
+    """Version of the shared pip, or None if it is not installed yet."""
+    from envtool import sync
+    site_packages = sync.get_site_packages(TOOL_ENV)
+    if not site_packages:
+        return None
+    for dist_info in site_packages.glob("pip-*.dist-info"):
+        meta = sync._read_metadata(dist_info)
+        if meta:
+            return meta[1]
+    return None
+
+def ensure_shared_pip():
+    """Create the tool env on first use and bring its pip to PIP_VERSION. Returns the tool interpreter.
+
+    Building the env only needs the bundled ensurepip wheel; the network is touched just once per
+    machine (and again whenever PIP_VERSION changes).
+    """
+    from packaging.version import Version
+    with core.env_lock(TOOL_ENV, quiet=True):
+        if not tool_python().exists():
+            TOOL_ENV.parent.mkdir(parents=True, exist_ok=True)
+            core.build_venv_atomic(TOOL_ENV, with_pip=True, python=sys.executable)
+        if shared_pip_version() != PIP_VERSION and _should_attempt_upgrade():
+            result = subprocess.run(
+                [str(tool_python()), "-m", "pip", "install", "-q", "--disable-pip-version-check", f"pip=={PIP_VERSION}"],
+                capture_output=True, text=True,
+            ) if core.is_online() else None
+            if result is None or result.returncode != 0:
+                ATTEMPT_FILE.write_text(json.dumps({"version": PIP_VERSION, "time": time.time()}))
+                if core.DEBUG_MODE:
+                    core.console.print(f"[dim]Could not install pip {PIP_VERSION} into {TOOL_ENV}; will retry later.[/dim]")
+            else:
+                ATTEMPT_FILE.unlink(missing_ok=True)
+
+        version = shared_pip_version()
+        if not version or Version(version) < Version(MIN_PIP_VERSION):
+            raise SharedPipError(
+                f"The shared pip in {TOOL_ENV} is {version or 'missing'}; pip-less envs need pip >= "
+                f"{MIN_PIP_VERSION}. Connect to the internet and retry, or create the env without --no-pip."
+            )
+    return tool_python()
+
+def _should_attempt_upgrade():
+    """False if installing this PIP_VERSION already failed recently."""
+    try:
+        attempt = json.loads(ATTEMPT_FILE.read_text())
+    except (OSError, ValueError):
+        return True
+    return attempt.get("version") != PIP_VERSION or time.time() - attempt.get("time", 0) > RETRY_SECONDS
+
+def pip_command(venv_path):
+    """argv prefix that runs pip against a venv: its own pip if it has one, else the shared pip via --python."""
+    venv_path = Path(venv_path)
+    python_exe = api.python_exe_for(venv_path)
+    if has_own_pip(venv_path):
+        return [str(python_exe), "-m", "pip"]
+    return [str(ensure_shared_pip()), "-m", "pip", "--python", str(python_exe), "--disable-pip-version-check"]
@@ -0,0 +1,372 @@
+import re
+import sys
+import json
+import shlex
+from pathlib import Path
+from packaging.requirements import Requirement, InvalidRequirement
+from packaging.utils import canonicalize_name
+from packaging.version import Version, InvalidVersion
+from rich.table import Table
+from envtool import core, telemetry
+
+# Bootstrap packages every venv ships with; never uninstalled as "extras"
+PROTECTED = {"pip", "setuptools", "wheel"}
+
+def _logical_lines(path):
+    """Yield requirement lines with comments stripped and backslash continuations joined."""
+    buffer = ""
+    for raw in Path(path).read_text().splitlines():
+        line = re.sub(r"(^|\s)#.*$", "", raw).rstrip()
+        if line.endswith("\\"):
+            buffer += line[:-1] + " "
+            continue
+        line = (buffer + line).strip()
+        buffer = ""
+        if line:
+            yield line
+    if buffer.strip():
+        yield buffer.strip()
+
+def parse_requirements(path, _seen=None):
+    """Parse a requirements file, following -r/-c includes.
+
+    Returns a dict with 'requirements' and 'constraints' (lists of packaging Requirements),
+    'unmanaged' (editable/URL lines that can't be compared and are passed to pip verbatim),
+    'pip_options' (every other option line, e.g. index flags or --prefer-binary), 'hashes' (canonical name -> ['sha256:...'] for
+    hash-pinned requirements) and 'files' (every file referenced, existing or not).
+    """
+    path = Path(path).resolve()
+    _seen = _seen if _seen is not None else set()
+    result = {"requirements": [], "constraints": [], "unmanaged": [], "pip_options": [], "hashes": {}, "files": [path]}
+    if path in _seen or not path.exists():
+        return result
+    _seen.add(path)
+
+    for line in _logical_lines(path):
+        tokens = shlex.split(line, posix=sys.platform != "win32")
+        flag = tokens[0].split("=", 1)[0]
+        value = tokens[0].split("=", 1)[1] if "=" in tokens[0] else " ".join(tokens[1:])
+
+        if flag in ("-r", "--requirement", "-c", "--constraint"):
+            nested = parse_requirements(path.parent / value, _seen)
+            if flag in ("-c", "--constraint"):
+                # Everything in a constraints file only constrains
+                nested["constraints"] += nested.pop("requirements")
+                nested["requirements"] = []
+            for key in result:
+                if key == "hashes":
+                    result[key].update(nested[key])
+                else:
+                    result[key] += nested[key]
+        elif flag in ("-e", "--editable") or line.startswith(("git+", "http:", "https:", "file:", ".")):
+            result["unmanaged"].append(line)
+        elif line.startswith("-"):
+            # Options install nothing themselves; they are forwarded to pip alongside whatever is installed
+            result["pip_options"] += tokens
+        else:
+            # Hashes are kept aside so a delta install can stay in hash-checking mode
+            hashes = re.findall(r"--hash[=\s](\S+)", line)
+            line = re.sub(r"\s+--hash[=\s]\S+", "", line)
+            try:
+                req = Requirement(line)
+            except InvalidRequirement:
+                result["unmanaged"].append(line)
+                continue
+            result["requirements"].append(req)
+            if hashes:
+                result["hashes"][canonicalize_name(req.name)] = hashes
+    return result
+
+def get_site_packages(venv_path):
+    if sys.platform == "win32":
+        return Path(venv_path) / "Lib" / "site-packages"
+    matches = sorted(Path(venv_path).glob("lib/python*/site-packages"))
+    return matches[-1] if matches else None
+
+def _read_metadata(dist_info):
+    """Pull Name, Version and Requires-Dist out of METADATA headers without a full email parse."""
+    name, version, requires = None, None, []
+    try:
+        with open(dist_info / "METADATA", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                if not line.strip():
+                    break  # end of headers, the rest is the long description
+                if line.startswith("Name:"):
+                    name = line[5:].strip()
+                elif line.startswith("Version:"):
+                    version = line[8:].strip()
+                elif line.startswith("Requires-Dist:"):
+                    requires.append(line[14:].strip())
+    except OSError:
+        return None
+    return name, version, requires
+
+def scan_installed(venv_path):
+    """Map canonical name -> {'name', 'version', 'requires'} from the venv's dist-info folders."""
+    installed = {}
+    site_packages = get_site_packages(venv_path)
+    if not site_packages or not site_packages.exists():
+        return installed
+    for dist_info in site_packages.glob("*.dist-info"):
+        meta = _read_metadata(dist_info)
+        if not meta or not meta[0]:
+            continue
+        name, version, requires = meta
+        installed[canonicalize_name(name)] = {"name": name, "version": version, "requires": requires, "path": dist_info}
+    return installed
+
+MARKER_ENV_SCRIPT = """
+import os, sys, json, platform
+def fmt(info):
+    v = f"{info.major}.{info.minor}.{info.micro}"
+    return v if info.releaselevel == "final" else v + info.releaselevel[0] + str(info.serial)
+print(json.dumps({
+    "implementation_name": sys.implementation.name,
+    "implementation_version": fmt(sys.implementation.version),
+    "os_name": os.name,
+    "platform_machine": platform.machine(),
+    "platform_release": platform.release(),
+    "platform_system": platform.system(),
+    "platform_version": platform.version(),
+    "python_full_version": platform.python_version(),
+    "platform_python_implementation": platform.python_implementation(),
+    "python_version": ".".join(platform.python_version_tuple()[:2]),
+    "sys_platform": sys.platform,
+}))
+"""
+
+def get_marker_environment(python_exe):
+    """Marker environment of the venv interpreter, which may differ from the one running envtool."""
+    result = core.run_command([str(python_exe), "-c", MARKER_ENV_SCRIPT], capture_output=True)
+    return json.loads(result.stdout) if result else None
+
+def _applies(req, marker_env, extras=()):
+    if req.marker is None:
+        return True
+    envs = [dict(marker_env or {}, extra=e) for e in (extras or [""])]
+    return any(req.marker.evaluate(env) for env in envs)
+
+def _satisfied(req, info, constraints):
+    if info is None:
+        return False
+    if req.url:
+        # Direct references are satisfied only by an install from the same URL
+        try:
+            direct = json.loads((info["path"] / "direct_url.json").read_text())
+        except (OSError, ValueError):
+            return False
+        if _normalize_url(direct.get("url", "")) != _normalize_url(req.url):
+            return False
+        rev = _url_revision(req.url)
+        if rev:
+            vcs = direct.get("vcs_info", {})
+            return rev == vcs.get("requested_revision") or vcs.get("commit_id", "").startswith(rev)
+        return True
+    try:
+        version = Version(info["version"])
+    except InvalidVersion:
+        return not req.specifier
+    for spec in [req.specifier] + [c.specifier for c in constraints.get(canonicalize_name(req.name), [])]:
+        if not spec.contains(version, prereleases=True):
+            return False
+    return True
+
+def _normalize_url(url):
+    """Compare URLs the way pip records them in direct_url.json: no vcs+ prefix, @rev or #fragment."""
+    url = url.split("#", 1)[0]
+    scheme, sep, rest = url.partition("://")
+    if "+" in scheme:
+        scheme = scheme.split("+", 1)[1]
+        host, slash, path = rest.partition("/")
+        rest = host + slash + path.rsplit("@", 1)[0] if "@" in path else rest
+    return f"{scheme}{sep}{rest}".rstrip("/")
+
+def _url_revision(url):
+    """The @rev pinned by a vcs+ URL (git+https://host/repo@v1), or None."""
+    scheme, _, rest = url.split("#", 1)[0].partition("://")
+    path = rest.partition("/")[2]
+    if "+" not in scheme or "@" not in path:
+        return None
+    return path.rsplit("@", 1)[1]
+
+def _unmanaged_target(line):
+    """(normalized url, editable, extras) a -e/path/URL line installs from, or None for option lines."""
+    tokens = shlex.split(line, posix=sys.platform != "win32")
+    editable = tokens[0].split("=", 1)[0] in ("-e", "--editable")
+    if editable:
+        value = tokens[0].split("=", 1)[1] if "=" in tokens[0] else (tokens[1] if len(tokens) > 1 else "")
+    elif line.startswith("-"):
+        return None
+    else:
+        value = tokens[0]
+    m = re.match(r"^(.*?)(\[[^\]]*\])?$", value.split("#", 1)[0])
+    location, extras = m.group(1), m.group(2) or ""
+    if "://" in location or location.startswith("file:"):
+        url = location
+    else:
+        # pip resolves local paths against the working directory
+        url = Path(location).expanduser().resolve().as_uri()
+    return _normalize_url(url), editable, extras
+
+def _installed_by_url(installed):
+    """Map (normalized url, editable) -> canonical name for dists installed from a direct URL or path."""
+    by_url = {}
+    for name, info in installed.items():
+        try:
+            direct = json.loads((info["path"] / "direct_url.json").read_text())
+        except (OSError, ValueError):
+            continue
+        if direct.get("url"):
+            editable = bool(direct.get("dir_info", {}).get("editable"))
+            by_url[(_normalize_url(direct["url"]), editable)] = name
+    return by_url
+
+def reachable_from(roots, installed, marker_env):
+    """Walk Requires-Dist from the root requirements and return every canonical name they pull in."""
+    seen = set()
+    stack = [(canonicalize_name(r.name), tuple(r.extras)) for r in roots]
+    while stack:
+        name, extras = stack.pop()
+        key = (name, extras)
+        if key in seen:
+            continue
+        seen.add(key)
+        info = installed.get(name)
+        if not info:
+            continue
+        for spec in info["requires"]:
+            try:
+                dep = Requirement(spec)
+            except InvalidRequirement:
+                continue
+            if _applies(dep, marker_env, extras):
+                stack.append((canonicalize_name(dep.name), tuple(dep.extras)))
+    return {name for name, _ in seen}
+
+def compute_sync_plan(req_file, venv_path, python_exe):
+    """Diff requirements against the venv. Returns (to_install, to_remove, parsed)."""
+    parsed = parse_requirements(req_file)
+    installed = scan_installed(venv_path)
+    marker_env = get_marker_environment(python_exe)
+
+    constraints = {}
+    for c in parsed["constraints"]:
+        constraints.setdefault(canonicalize_name(c.name), []).append(c)
+
+    roots = [r for r in parsed["requirements"] if _applies(r, marker_env)]
+    to_install = []
+    keep = set(PROTECTED)
+    for r in roots:
+        closure = reachable_from([r], installed, marker_env)
+        keep |= closure
+        # A satisfied root still needs pip if one of its (extra) dependencies is missing
+        if not _satisfied(r, installed.get(canonicalize_name(r.name)), constraints) or not closure <= installed.keys():
+            to_install.append(r)
+
+    # Unmanaged lines (editables, URLs) are skipped once the dist they installed is found, via
+    # #egg= or the URL recorded in its direct_url.json
+    pending, unmapped = [], False
+    by_url = _installed_by_url(installed)
+    for line in parsed["unmanaged"]:
+        target = _unmanaged_target(line)
+        m = re.search(r"#egg=([\w.\-]+)", line)
+        name = canonicalize_name(m.group(1)) if m and canonicalize_name(m.group(1)) in installed else None
+        if name is None and target:
+            name = by_url.get((target[0], target[1]))
+        if name:
+            extras = target[2] if target else ""
+            keep |= reachable_from([Requirement(name + extras)], installed, marker_env)
+        else:
+            pending.append(line)
+            # Without knowing what a line installs, its dependencies can't be told apart from extras
+            unmapped = unmapped or target is not None
+    parsed["unmanaged"] = pending
+
+    to_remove = [] if unmapped else sorted(info["name"] for name, info in installed.items() if name not in keep)
+    return to_install, to_remove, parsed
+
+def sync_dependencies(dry_run=False, remove_extras=True):
+    """Install only missing/mismatched requirements and uninstall packages nothing requires"""
+    python_exe = core.get_python_exe()
+    if not python_exe.exists():
+        return False, "Virtual environment not found. Run 'env' first."
+
+    req_file = Path.cwd() / "requirements.txt"
+    if not req_file.exists():
+        return False, "requirements.txt not found. Run 'env freeze' first."
+
+    venv_path = core.get_venv_path()
+    with core.env_lock(venv_path):
+        with core.console.status("[bold yellow]Computing sync plan...", spinner="dots"):
+            to_install, to_remove, parsed = compute_sync_plan(req_file, venv_path, python_exe)
+        if not remove_extras:
+            to_remove = []
+        unmanaged = parsed["unmanaged"]
+
+        if not to_install and not to_remove and not unmanaged:
+            return True, "Environment already in sync. Nothing to do."
+
+        table = Table(title="🔁 [bold cyan]Sync Plan[/bold cyan]", box=None)
+        table.add_column("Action", style="bold")
+        table.add_column("Package", style="cyan")
+        for r in to_install:
+            table.add_row("[green]install[/green]", str(r))
+        for line in unmanaged:
+            table.add_row("[yellow]pass-through[/yellow]", line)
+        for name in to_remove:
+            table.add_row("[red]remove[/red]", name)
+        core.console.print(table)
+
+        if dry_run:
+            return True, "Dry run: no changes made."
+
+        from envtool import shared_pip
+        try:
+            pip_cmd = shared_pip.pip_command(venv_path)
+        except shared_pip.SharedPipError as e:
+            return False, str(e)
+
+        if to_install or unmanaged:
+            if not core.is_online():
+                return False, "Offline: cannot install missing packages."
+            args = pip_cmd + ["install"] + parsed["pip_options"]
+            temp_files = []
+
+            def _temp_file(lines):
+                import tempfile
+                f = tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False)
+                f.write("\n".join(lines) + "\n")
+                f.close()
+                temp_files.append(f.name)
+                return f.name
+
+            if parsed["hashes"]:
+                # Hashes can only be given in a requirements file; passing them keeps pip in hash-checking mode
+                hashed = [" ".join([str(r)] + [f"--hash={h}" for h in parsed["hashes"].get(canonicalize_name(r.name), [])])
+                          for r in to_install]
+                if hashed:
+                    args += ["-r", _temp_file(hashed)]
+            else:
+                args += [str(r) for r in to_install]
+            for line in unmanaged:
+                args += shlex.split(line, posix=sys.platform != "win32")
+            if parsed["constraints"]:
+                args += ["-c", _temp_file([str(c) for c in parsed["constraints"]])]
+            try:
+                result = telemetry.run_pip(args, label="Installing changes")
+            finally:
+                for name in temp_files:
+                    Path(name).unlink(missing_ok=True)
+            if not result:
+                return False, "Failed to install changed packages."
+            if remove_extras:
+                # Newly installed packages can change what is reachable
+                _, to_remove, _ = compute_sync_plan(req_file, venv_path, python_exe)
+
+        if to_remove:
+            with core.console.status("[bold yellow]Removing extras...", spinner="dots"):
+                result = core.run_command(pip_cmd + ["uninstall", "-y", "-q"] + to_remove)
+            if not result:
+                return False, "Failed to uninstall extra packages."
+
+    return True, f"Synced: {len(to_install)} installed, {len(to_remove)} removed."
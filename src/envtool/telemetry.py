@@ -0,0 +1,243 @@
+import os
+import re
+import json
+import time
+import subprocess
+from pathlib import Path
+from rich.progress import Progress, SpinnerColumn, TextColumn, TimeElapsedColumn
+from rich.table import Table
+from envtool import core
+
+TELEMETRY_FILE = Path.home() / ".envtool" / "telemetry.json"
+HISTORY_LIMIT = 20
+
+COLLECT_RE = re.compile(r"^Collecting\s+([A-Za-z0-9][A-Za-z0-9._\-]*)")
+SATISFIED_RE = re.compile(r"^Requirement already satisfied")
+PROCESS_RE = re.compile(r"^Processing\s+\S*?([A-Za-z0-9][A-Za-z0-9._]*)-\d")
+DOWNLOAD_RE = re.compile(r"^(Downloading|Using cached)\s+(\S+)")
+# Steps pip runs before building an sdist; their cost belongs to the build
+PREPARE_RE = re.compile(r"^(Installing build dependencies|Getting requirements to build wheel|Preparing (?:wheel )?metadata)")
+BUILD_START_RE = re.compile(r"^Building wheel for ([A-Za-z0-9._\-]+) \(.*\)(?::| \.\.\.) ?started")
+BUILD_DONE_RE = re.compile(r"^Building wheel for ([A-Za-z0-9._\-]+) \(.*\)(?::| \.\.\.) ?(finished|done)")
+INSTALLING_RE = re.compile(r"^Installing collected packages: (.+)")
+SUCCESS_RE = re.compile(r"^Successfully installed (.+)")
+
+def _canon(name):
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+class InstallTracker:
+    """Turns pip's line output into per-package timings as it streams in."""
+
+    def __init__(self):
+        self.packages = {}
+        self.current = None
+        self.phase_started = None
+        self.install_started = None
+        self.install_seconds = 0.0
+        self.installed = []
+
+    def _pkg(self, name):
+        return self.packages.setdefault(_canon(name), {
+            "name": name, "resolve": 0.0, "download": 0.0, "build": 0.0,
+            "cached": False, "from_source": False, "downloaded": None,
+        })
+
+    def _close_phase(self, now):
+        if self.current and self.phase_started is not None:
+            name, phase = self.current
+            self._pkg(name)[phase] += now - self.phase_started
+        self.current, self.phase_started = None, None
+
+    def _open_phase(self, name, phase, now):
+        self._close_phase(now)
+        self.current, self.phase_started = (name, phase), now
+
+    def feed(self, line, now=None):
+        """Consume one line of pip output. Returns a short description of what pip is doing, or None."""
+        now = time.perf_counter() if now is None else now
+        line = line.strip()
+
+        m = COLLECT_RE.match(line) or PROCESS_RE.match(line)
+        if m:
+            self._open_phase(m.group(1), "resolve", now)
+            return f"Resolving {m.group(1)}"
+
+        if SATISFIED_RE.match(line) or line.startswith("Building wheels for collected packages"):
+            self._close_phase(now)
+            return None
+
+        m = DOWNLOAD_RE.match(line)
+        if m and self.current:
+            name = self.current[0]
+            pkg = self._pkg(name)
+            pkg["downloaded"] = m.group(2)
+            pkg["cached"] = m.group(1) == "Using cached"
+            if not m.group(2).endswith(".whl"):
+                pkg["from_source"] = True
+            self._open_phase(name, "download", now)
+            return f"{m.group(1)} {m.group(2)}"
+
+        m = PREPARE_RE.match(line)
+        if m and self.current:
+            name, phase = self.current
+            if phase != "build":
+                self._open_phase(name, "build", now)
+                self._pkg(name)["from_source"] = True
+            return f"{m.group(1)} for {name}"
+
+        m = BUILD_START_RE.match(line)
+        if m:
+            if self.current is None or _canon(self.current[0]) != _canon(m.group(1)) or self.current[1] != "build":
+                self._open_phase(m.group(1), "build", now)
+            self._pkg(m.group(1))["from_source"] = True
+            return f"Building {m.group(1)} from source"
+
+        m = BUILD_DONE_RE.match(line)
+        if m:
+            # pip may print "... done" on one line without a separate "started"
+            if not self.current or self.current != (m.group(1), "build"):
+                self._pkg(m.group(1))["from_source"] = True
+            self._close_phase(now)
+            return f"Built {m.group(1)}"
+
+        m = INSTALLING_RE.match(line)
+        if m:
+            self._close_phase(now)
+            self.install_started = now
+            return f"Installing {len(m.group(1).split(','))} packages"
+
+        m = SUCCESS_RE.match(line)
+        if m:
+            if self.install_started is not None:
+                self.install_seconds = now - self.install_started
+            self.installed = m.group(1).split()
+            return "Done"
+        return None
+
+    def finish(self, now=None):
+        self._close_phase(time.perf_counter() if now is None else now)
+        if self.install_started is not None and not self.install_seconds:
+            self.install_seconds = (time.perf_counter() if now is None else now) - self.install_started
+
+    def slowest(self, limit=10):
+        rows = [p for p in self.packages.values() if p["download"] + p["build"] + p["resolve"] > 0]
+        rows.sort(key=lambda p: p["download"] + p["build"] + p["resolve"], reverse=True)
+        return rows[:limit]
+
+def load_telemetry():
+    try:
+        return json.loads(TELEMETRY_FILE.read_text())
+    except (OSError, ValueError):
+        return {}
+
+def save_run(tracker):
+    """Append this run's timings to the persisted per-package history."""
+    data = load_telemetry()
+    stamp = time.strftime("%Y-%m-%dT%H:%M:%S")
+    for key, pkg in tracker.packages.items():
+        entry = data.setdefault(key, {"name": pkg["name"], "runs": []})
+        entry["runs"].append({
+            "at": stamp, "resolve": round(pkg["resolve"], 3), "download": round(pkg["download"], 3),
+            "build": round(pkg["build"], 3), "cached": pkg["cached"], "from_source": pkg["from_source"],
+        })
+        entry["runs"] = entry["runs"][-HISTORY_LIMIT:]
+    try:
+        TELEMETRY_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp = TELEMETRY_FILE.with_suffix(f".tmp-{os.getpid()}")
+        tmp.write_text(json.dumps(data, indent=2))
+        os.replace(tmp, TELEMETRY_FILE)
+    except OSError as e:
+        if core.DEBUG_MODE: core.console.print(f"[dim]Failed to save telemetry: {e}[/dim]")
+
+def _timings_table(title, rows):
+    table = Table(title=title, box=None)
+    table.add_column("Package", style="cyan")
+    table.add_column("Resolve", justify="right", style="dim")
+    table.add_column("Download", justify="right")
+    table.add_column("Build", justify="right")
+    table.add_column("Source", style="dim")
+    for r in rows:
+        source = "[yellow]sdist build[/yellow]" if r["from_source"] else ("cache" if r["cached"] else "wheel")
+        table.add_row(r["name"], f"{r['resolve']:.1f}s", f"{r['download']:.1f}s", f"{r['build']:.1f}s", source)
+    return table
+
+def run_pip(args, label="Installing dependencies"):
+    """Run a pip command, streaming its output into a live progress display and timing every package.
+
+    Returns a CompletedProcess like run_command does, or None on failure.
+    """
+    args = [str(a) for a in args] + ["--progress-bar", "off"]
+    if core.DEBUG_MODE:
+        core.console.print(f"[dim]Executing: {' '.join(args)}[/dim]")
+
+    tracker = InstallTracker()
+    output = []
+    env = dict(os.environ, PYTHONUNBUFFERED="1")
+    progress = Progress(
+        SpinnerColumn(), TextColumn("[bold yellow]{task.description}"),
+        TextColumn("[dim]{task.fields[detail]}"), TimeElapsedColumn(),
+        console=core.console, transient=True,
+    )
+    start = time.perf_counter()
+    try:
+        with progress:
+            task = progress.add_task(label, detail="", total=None)
+            proc = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1, env=env)
+            for line in proc.stdout:
+                output.append(line)
+                if core.DEBUG_MODE:
+                    progress.console.print(f"[dim]{line.rstrip()}[/dim]")
+                detail = tracker.feed(line)
+                if detail:
+                    progress.update(task, detail=f"{detail} · {len(tracker.packages)} packages")
+            returncode = proc.wait()
+    except OSError as e:
+        core.console.print(f"[bold red]Error:[/bold red] Could not run pip: {e}")
+        return None
+
+    tracker.finish()
+    elapsed = time.perf_counter() - start
+    stdout = "".join(output)
+    if returncode != 0:
+        core.console.print(f"[bold red]Error:[/bold red] Command '{' '.join(args)}' failed.")
+        core.console.print(f"[red]{''.join(output[-20:]).strip()}[/red]")
+        return None
+
+    save_run(tracker)
+    slow = [p for p in tracker.slowest(5) if p["download"] + p["build"] >= 0.5]
+    if slow:
+        core.console.print(_timings_table(f"⏱️  [bold]Slowest packages[/bold] [dim](total {elapsed:.1f}s, install phase {tracker.install_seconds:.1f}s)[/dim]", slow))
+    built = sorted(p["name"] for p in tracker.packages.values() if p["from_source"])
+    if built:
+        core.console.print(f"[yellow]Built from source:[/yellow] {', '.join(built)} [dim](consider a wheelhouse or pinning)[/dim]")
+    return subprocess.CompletedProcess(args, returncode, stdout=stdout, stderr="")
+
+def display_stats(limit=15):
+    """Show the packages that historically cost the most install time"""
+    data = load_telemetry()
+    if not data:
+        core.console.print("[dim]No install telemetry recorded yet.[/dim]")
+        return
+
+    rows = []
+    for entry in data.values():
+        runs = entry["runs"]
+        rows.append({
+            "name": entry["name"],
+            "runs": len(runs),
+            "avg": sum(r["download"] + r["build"] for r in runs) / len(runs),
+            "max_build": max(r["build"] for r in runs),
+            "from_source": any(r["from_source"] for r in runs),
+        })
+    rows.sort(key=lambda r: r["avg"], reverse=True)
+
+    table = Table(title="📊 [bold green]Install Telemetry[/bold green]", box=None)
+    table.add_column("Package", style="cyan")
+    table.add_column("Runs", justify="right", style="dim")
+    table.add_column("Avg cost", justify="right")
+    table.add_column("Max build", justify="right")
+    table.add_column("sdist", justify="center")
+    for r in rows[:limit]:
+        table.add_row(r["name"], str(r["runs"]), f"{r['avg']:.1f}s", f"{r['max_build']:.1f}s", "[yellow]yes[/yellow]" if r["from_source"] else "")
+    core.console.print(table)
+    core.console.print(f"[dim]Data: {TELEMETRY_FILE}[/dim]")
@@ -0,0 +1,173 @@
+"""Venv store primitives shared by the CLI and the API: names, locks and atomic build/remove.
+
+Nothing here prints; core wraps env_lock to report lock waits on the console.
+"""
+import os
+import re
+import sys
+import time
+import venv
+import shutil
+import hashlib
+import subprocess
+from contextlib import contextmanager
+from pathlib import Path
+
+ENV_NAME = "myenv"
+GLOBAL_ENV_BASE = Path.home() / ".envtool" / "envs"
+LOCK_DIR = Path.home() / ".envtool" / "locks"
+
+def is_valid_env_name(name):
+    """Global env names must be a single, non-hidden path component."""
+    return bool(name) and not name.startswith(".") and "/" not in name and "\\" not in name
+
+def get_lock_path(venv_path):
+    """Return the lock file guarding a venv. Global envs are keyed by name, anything else by path hash."""
+    venv_path = Path(venv_path).resolve()
+    if venv_path.parent == GLOBAL_ENV_BASE.resolve():
+        return LOCK_DIR / f"{venv_path.name}.lock"
+    digest = hashlib.sha1(str(venv_path).encode()).hexdigest()[:16]
+    return LOCK_DIR / f"{venv_path.name}-{digest}.lock"
+
+def _try_lock(fh, shared):
+    if sys.platform == "win32":
+        import msvcrt
+        # msvcrt has no shared locks, so readers are exclusive on Windows
+        try:
+            msvcrt.locking(fh.fileno(), msvcrt.LK_NBLCK, 1)
+            return True
+        except OSError:
+            return False
+    import fcntl
+    try:
+        fcntl.flock(fh.fileno(), (fcntl.LOCK_SH if shared else fcntl.LOCK_EX) | fcntl.LOCK_NB)
+        return True
+    except OSError:
+        return False
+
+def _unlock(fh):
+    if sys.platform == "win32":
+        import msvcrt
+        fh.seek(0)
+        msvcrt.locking(fh.fileno(), msvcrt.LK_UNLCK, 1)
+    else:
+        import fcntl
+        fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+
+@contextmanager
+def env_lock(venv_path, shared=False, on_wait=None, on_acquire=None):
+    """Hold a reader (shared) or writer (exclusive) lock on a venv for the duration of the block.
+
+    `on_wait()` is called once if the lock is busy, `on_acquire(lock_path)` once it is held.
+    """
+    lock_path = get_lock_path(venv_path)
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, "a+") as fh:
+        if not _try_lock(fh, shared):
+            if on_wait:
+                on_wait()
+            while not _try_lock(fh, shared):
+                time.sleep(0.1)
+        if on_acquire:
+            on_acquire(lock_path)
+        try:
+            yield
+        finally:
+            _unlock(fh)
+
+# Windows console-script launchers are a stub .exe, a '#!<python>' line, then a zip of the script
+LAUNCHER_SHEBANG_RE = re.compile(rb"#![^\r\n]*\r?\n(?=PK\x03\x04)")
+
+def _rewrite_launcher(data, old, new):
+    """Swap the prefix in a launcher's shebang. The zip offsets are relative to the zip itself, so
+    the line can change length; returns None if this is not a launcher pointing at `old`."""
+    matches = list(LAUNCHER_SHEBANG_RE.finditer(data))
+    if not matches or old not in matches[-1].group(0):
+        return None
+    m = matches[-1]
+    return data[:m.start()] + m.group(0).replace(old, new) + data[m.end():]
+
+def path_forms(path):
+    """The absolute and the symlink-resolved spelling of a path, longest first. venv writes the
+    former, so under a symlinked directory the two differ."""
+    return sorted({os.path.abspath(path), os.path.realpath(path)}, key=len, reverse=True)
+
+def rewrite_venv_paths(venv_path, old_prefix, new_prefix):
+    """Replace an absolute venv prefix in pyvenv.cfg, the text scripts of bin/ (Scripts/ on Windows)
+    and the shebangs of Windows .exe launchers. `old_prefix` may be a list of spellings to replace."""
+    venv_path = Path(venv_path)
+    if isinstance(old_prefix, (str, os.PathLike)):
+        old_prefix = [old_prefix]
+    olds, new = [str(o).encode() for o in old_prefix], str(new_prefix).encode()
+    scripts_dir = venv_path / ("Scripts" if sys.platform == "win32" else "bin")
+    candidates = [venv_path / "pyvenv.cfg"]
+    if scripts_dir.is_dir():
+        candidates.extend(scripts_dir.iterdir())
+
+    rewritten = 0
+    for f in candidates:
+        if f.is_symlink() or not f.is_file():
+            continue
+        original = data = f.read_bytes()
+        for old in olds:
+            if old not in data:
+                continue
+            if b"\0" in data:
+                # Other binaries (copied interpreters) break if lengths change; only launchers are patched
+                data = _rewrite_launcher(data, old, new) or data
+            else:
+                data = data.replace(old, new)
+        if data != original:
+            f.write_bytes(data)
+            rewritten += 1
+    return rewritten
+
+def build_venv_atomic(target_path, with_pip=True, python=None, replace=False):
+    """Build a venv in a sibling temp directory and rename it into place, so readers never see a half-built env.
+
+    `python` defaults to the interpreter selected with --python, falling back to the running one.
+    With `replace`, an existing env at the target is swapped out only once the new one is built.
+    On Windows the env is built at its final path (callers hold its lock): pip's launchers embed
+    the build path, so they would otherwise point at the deleted temp directory.
+    """
+    from envtool import pythons
+    target_path = Path(target_path)
+    in_place = sys.platform == "win32"
+    tmp_path = target_path if in_place else target_path.parent / f".{target_path.name}.tmp-{os.getpid()}"
+    if tmp_path.exists() and not in_place:
+        shutil.rmtree(tmp_path)
+    python = python or pythons.get_selected_python()
+    old_path = None
+    if replace and target_path.exists():
+        old_path = target_path.parent / f".{target_path.name}.old-{os.getpid()}"
+        if in_place:
+            os.rename(target_path, old_path)
+    try:
+        if python and os.path.realpath(python) != os.path.realpath(sys.executable):
+            # The prompt would otherwise default to the temp directory's name
+            args = [str(python), "-m", "venv", "--prompt", target_path.name, str(tmp_path)]
+            if not with_pip:
+                args.append("--without-pip")
+            subprocess.run(args, check=True, capture_output=True, text=True)
+        else:
+            venv.create(tmp_path, with_pip=with_pip, prompt=target_path.name)
+        if not in_place:
+            rewrite_venv_paths(tmp_path, path_forms(tmp_path), target_path.resolve())
+            if old_path:
+                os.rename(target_path, old_path)
+            os.rename(tmp_path, target_path)
+    except BaseException:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        if old_path and old_path.exists() and not target_path.exists():
+            os.rename(old_path, target_path)
+        raise
+    if old_path:
+        shutil.rmtree(old_path, ignore_errors=True)
+    return target_path
+
+def remove_venv_atomic(target_path):
+    """Rename a venv out of the way before deleting it, so readers never see a half-deleted env."""
+    target_path = Path(target_path)
+    trash_path = target_path.parent / f".{target_path.name}.del-{os.getpid()}"
+    os.rename(target_path, trash_path)
+    shutil.rmtree(trash_path)
@@ -0,0 +1,154 @@
+import os
+import sys
+import time
+import select
+import struct
+from pathlib import Path
+from envtool import core, sync
+
+DEBOUNCE_SECONDS = 0.3
+POLL_INTERVAL = 0.5
+
+# inotify flags (linux/inotify.h)
+IN_MODIFY = 0x002
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_NONBLOCK = 0o4000
+EVENT_HEADER = struct.Struct("iIII")
+
+def watched_files(req_file, env_file):
+    """requirements.txt, every file it pulls in via -r/-c, and .env."""
+    return set(sync.parse_requirements(req_file)["files"]) | {env_file.resolve()}
+
+def _snapshot(files):
+    state = {}
+    for f in files:
+        try:
+            st = f.stat()
+            state[f] = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            state[f] = None
+    return state
+
+class _Inotify:
+    """Minimal ctypes binding: watches the parent directories so editor rename-saves are seen too."""
+
+    def __init__(self):
+        import ctypes
+        import ctypes.util
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self.fd = libc.inotify_init1(IN_NONBLOCK)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.dirs = {}
+
+    def watch(self, files):
+        mask = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+        for directory in {f.parent for f in files}:
+            if directory not in self.dirs.values():
+                wd = self._add_watch(self.fd, os.fsencode(directory), mask)
+                if wd >= 0:
+                    self.dirs[wd] = directory
+
+    def wait(self, timeout):
+        """Block up to `timeout` seconds; return the set of paths touched."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        touched = set()
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return touched
+        offset = 0
+        while offset < len(data):
+            wd, _, _, length = EVENT_HEADER.unpack_from(data, offset)
+            name = data[offset + EVENT_HEADER.size: offset + EVENT_HEADER.size + length].rstrip(b"\0")
+            if wd in self.dirs and name:
+                touched.add((self.dirs[wd] / os.fsdecode(name)).resolve())
+            offset += EVENT_HEADER.size + length
+        return touched
+
+    def close(self):
+        os.close(self.fd)
+
+def _make_inotify():
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        return _Inotify()
+    except (OSError, AttributeError):
+        return None
+
+def _wait_for_change(files, inotify, state):
+    """Block until one of `files` changes, then keep absorbing events until things go quiet."""
+    while True:
+        if inotify:
+            if not inotify.wait(None) & files:
+                continue
+        else:
+            time.sleep(POLL_INTERVAL)
+            if _snapshot(files) == state:
+                continue
+        # Debounce: editors and formatters often write several times in a row
+        while True:
+            if inotify:
+                if not inotify.wait(DEBOUNCE_SECONDS):
+                    break
+            else:
+                before = _snapshot(files)
+                time.sleep(DEBOUNCE_SECONDS)
+                if _snapshot(files) == before:
+                    break
+        new_state = _snapshot(files)
+        if new_state != state:
+            return new_state
+
+def watch_project(prune=False, use_polling=False):
+    """Keep the venv in sync with requirements.txt (and report .env changes) until interrupted"""
+    python_exe = core.get_python_exe()
+    if not python_exe.exists():
+        core.console.print("[bold red]Venv not detected.[/bold red] Run 'env' to create one first.")
+        return
+
+    req_file = core.ensure_requirements_exists()
+    env_file = Path.cwd() / ".env"
+    inotify = None if use_polling else _make_inotify()
+    backend = "inotify" if inotify else f"polling every {POLL_INTERVAL}s"
+
+    # Start from a synced state so later runs only see the edits; never uninstall before an edit
+    success, message = sync.sync_dependencies(remove_extras=False)
+    core.console.print(f"✅ {message}" if success else f"[red]{message}[/red]")
+
+    files = watched_files(req_file, env_file)
+    state = _snapshot(files)
+    core.console.print(f"\n👀 [bold cyan]Watching {len(files)} files[/bold cyan] [dim]({backend}, Ctrl+C to stop)[/dim]")
+    try:
+        while True:
+            if inotify:
+                inotify.watch(files)
+            new_state = _wait_for_change(files, inotify, state)
+            changed = sorted(f for f in files if new_state.get(f) != state.get(f))
+            state = new_state
+            names = ", ".join(f.name for f in changed)
+            core.console.print(f"\n[bold yellow]🔔 Changed:[/bold yellow] {names} [dim]({time.strftime('%H:%M:%S')})[/dim]")
+
+            if env_file.resolve() in changed:
+                core.console.print("[dim].env updated; it is re-read on the next 'env run'.[/dim]")
+            if any(f != env_file.resolve() for f in changed):
+                start = time.perf_counter()
+                success, message = sync.sync_dependencies(remove_extras=prune)
+                elapsed = time.perf_counter() - start
+                core.console.print(f"✅ {message} [dim]({elapsed:.1f}s)[/dim]" if success else f"[red]{message}[/red]")
+                # Includes may have been added or removed
+                files = watched_files(req_file, env_file)
+                state = _snapshot(files)
+    except KeyboardInterrupt:
+        core.console.print("\n[dim]Stopped watching.[/dim]")
+    finally:
+        if inotify:
+            inotify.close()